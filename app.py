@@ -1,10 +1,88 @@
 import streamlit as st
 import asyncio
+import hashlib
+import json
+import platform
+import threading
 import time
-from extract_cleaner_webpage_sync import extract_clean_content
+from pathlib import Path
+import requests
+from streamlit_autorefresh import st_autorefresh
+from extract_cleaner_webpage_sync import extract_clean_content, get_extractor
+
+# Playwright subprocess transport needs the proactor loop on Windows
+if platform.system() == 'Windows':
+    asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+
+
+@st.cache_resource
+def get_worker_loop():
+    """Persistent asyncio loop on a daemon thread, shared across reruns.
+
+    Creating (and abandoning) a fresh loop per button click forced
+    Playwright to rebuild its transport state each time and leaked the
+    old loops; one long-lived loop avoids both.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+
+def run_async(coro):
+    """Run a coroutine on the persistent worker loop and wait for it."""
+    return asyncio.run_coroutine_threadsafe(coro, get_worker_loop()).result()
+
+
+# Result dicts can be large (content lists + screenshot path); keeping them
+# in st.session_state means Streamlit reserializes them on every rerun.
+# Spill them to disk and keep only a small key in session state.
+RESULT_CACHE_DIR = Path(".cache")
+
+
+def store_result(result):
+    """Write an extraction result to the disk cache; return its key."""
+    RESULT_CACHE_DIR.mkdir(exist_ok=True)
+    key = hashlib.md5(f"{result['url']}{result['extracted_at']}".encode()).hexdigest()
+    (RESULT_CACHE_DIR / f"{key}.json").write_text(json.dumps(result))
+    return key
+
+
+def load_result(key):
+    """Load a cached extraction result, or None if it's gone."""
+    path = RESULT_CACHE_DIR / f"{key}.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+@st.cache_resource
+def get_http_session():
+    """Shared requests.Session so HEAD probes reuse pooled connections."""
+    return requests.Session()
+
+
+def page_validator(url):
+    """Fetch a cheap change marker (ETag/Last-Modified) for a URL.
+
+    Returns None when the server offers neither header or the probe
+    fails — callers should treat that as "assume changed".
+    """
+    try:
+        resp = get_http_session().head(url, allow_redirects=True, timeout=5)
+        return resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+    except requests.RequestException:
+        return None
 
 # st.title("Web Content Extractor")
 st.set_page_config(layout="wide", initial_sidebar_state="collapsed", page_title="Web Content Extractor")
+
+# Warm up Playwright/Chromium in the background while the user types a
+# URL, so the first Extract doesn't pay the 1-2s browser cold start.
+# Fire-and-forget on the worker loop; extract_clean_content finds the
+# browser already running.
+if 'warm' not in st.session_state:
+    st.session_state.warm = True
+    asyncio.run_coroutine_threadsafe(get_extractor()._ensure_browser(), get_worker_loop())
 # Create a 2x2 table layout
 col1, col2 = st.columns(2)
 
@@ -29,17 +107,24 @@ with col1:
 with col2:
     # # Add some vertical space to align with the input box
     # st.markdown("<div style='margin-top: -50px;'></div>", unsafe_allow_html=True)
-    
+
     if interval > 0 and url:
         # Store the last run time in session state if not already there
         if 'last_run_time' not in st.session_state:
             st.session_state.last_run_time = time.time()
-        ph = st.empty()
-        N = interval
-        for secs in range(N,0,-1):
-            mm, ss = secs//60, secs%60
-            ph.metric("Countdown", f"{mm:02d}:{ss:02d}")
-            time.sleep(1)
+        # Client-side timer reruns the script when the interval elapses;
+        # unlike the old time.sleep countdown it never blocks the script
+        # thread, so the UI stays interactive between refreshes
+        st_autorefresh(interval=interval * 1000, key="refresh")
+
+        @st.fragment(run_every=1.0)
+        def countdown_panel():
+            # Only this metric rerenders each second, not the whole script
+            time_to_next = max(0, interval - (time.time() - st.session_state.last_run_time))
+            mm, ss = int(time_to_next) // 60, int(time_to_next) % 60
+            st.metric("Next refresh in", f"{mm:02d}:{ss:02d}")
+
+        countdown_panel()
 
 # Store the last run time in session state
 if 'last_run_time' not in st.session_state:
@@ -55,42 +140,66 @@ should_run = st.button("Extract Content") or (
 if should_run and url:
     # Update the last run time
     st.session_state.last_run_time = current_time
-    
-    with st.spinner("Extracting content..."):
-        # Run the async function using an event loop
-        loop = asyncio.ProactorEventLoop()
-        result = loop.run_until_complete(extract_clean_content(url))
-        
-        # Store the result in session state
-        st.session_state.result = result
-        
-        # Set a flag to indicate we have results
-        st.session_state.has_results = True
+
+    # Skip the full Chromium navigation when the server says the page
+    # hasn't changed since our cached result (ETag/Last-Modified match)
+    if 'etag' not in st.session_state:
+        st.session_state.etag = {}
+    validator = page_validator(url)
+    unchanged = (
+        validator is not None
+        and st.session_state.etag.get(url) == validator
+        and st.session_state.get('result_url') == url
+    )
+
+    if unchanged:
+        st.toast("Page unchanged since last scrape - reusing cached result")
+    else:
+        with st.spinner("Extracting content..."):
+            # Dispatch to the persistent worker loop
+            result = run_async(extract_clean_content(url))
+
+            # Keep only the cache key and URL in session state; the full
+            # result lives on disk
+            st.session_state.result_key = store_result(result)
+            st.session_state.result_url = result['url']
+            st.session_state.etag[url] = validator
+
+            # Set a flag to indicate we have results
+            st.session_state.has_results = True
 
 # Display the results if we have them
-if st.session_state.get('has_results', False):
-    result = st.session_state.result
-    
+@st.fragment
+def results_panel():
+    """Render the extracted content from session state.
+
+    As a fragment, its widgets diff against only this subtree — a rerun
+    elsewhere in the script doesn't reship the screenshot and link list.
+    """
+    if not st.session_state.get('has_results', False):
+        return
+
+    result = load_result(st.session_state.result_key)
+    if result is None:
+        return
+
     st.subheader("Extracted Title")
     st.write(result['clean_data']['title'])
-    
+
     st.subheader("Screenshot")
     st.image(result['screenshot_path'])
-    
+
     st.subheader("Main Content")
     for item in result['clean_data']['main_content']:
         st.write(f"**{item['type'].upper()}:** {item['text']}")
-    
+
     st.subheader("Links")
     for link in result['clean_data']['links']:
         st.write(f"- [{link['text']}]({link['url']})")
 
-# Add auto-rerun if interval is set
+
+results_panel()
+
+# Auto-refresh status (the st_autorefresh timer above drives the reruns)
 if interval > 0 and url:
     st.info(f"Auto-refreshing every {interval} seconds. Set interval to 0 to stop.")
-    time_to_next = max(0, interval - (time.time() - st.session_state.last_run_time))
-    st.write(f"Next refresh in {time_to_next:.1f} seconds")
-    
-    # This is the key part - use Streamlit's rerun to refresh the page
-    time.sleep(max(1, interval))  # Small delay to prevent too frequent reruns
-    st.rerun()
@@ -0,0 +1,144 @@
+"""
+Shared auto-refresh helpers for the quick-access Streamlit pages.
+
+qiangpiao.py and local/qiangpiaowang.py each carried their own copy of
+the cloud-vs-local "open a new tab" fallback and the countdown markup,
+so every fix to one copy had to be re-applied to the other. The copies
+live here once: the hoisted HTML templates, the import-time Streamlit
+Cloud detection, and the two rendering helpers both pages call.
+"""
+
+import json
+import html
+import os
+import platform
+import webbrowser
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+
+# Environment detection, done once at import: the answer can't change at
+# runtime and platform.processor() can spawn a subprocess on some
+# platforms, which the auto-refresh loop would otherwise repeat every tick
+def _detect_streamlit_cloud():
+    """Detect if running on Streamlit Cloud vs local development"""
+    # Authoritative when present; skips the platform probe entirely
+    if os.getenv('STREAMLIT_RUNTIME_ENV') == 'cloud':
+        return True
+    # Streamlit Cloud runs on Linux with empty processor string
+    # Also check for 'appuser' which is the default Streamlit Cloud user
+    return platform.processor() == '' or os.getenv('USER') == 'appuser'
+
+
+_IS_STREAMLIT_CLOUD = _detect_streamlit_cloud()
+
+
+def is_streamlit_cloud():
+    """Return the import-time Streamlit Cloud detection result"""
+    return _IS_STREAMLIT_CLOUD
+
+
+# Cloud-fallback auto-open markup, built once at import; only the URL
+# varies per tick. json.dumps / html.escape below keep quotes in the
+# URL from breaking out of the script or attribute.
+_AUTO_CLICK_HTML_TMPL = (
+    "<script>(function(){{"
+    "const link=document.createElement('a');"
+    "link.href={url_json};"
+    "link.target='_blank';"
+    "link.rel='noopener noreferrer';"
+    "document.body.appendChild(link);"
+    "link.click();"
+    "document.body.removeChild(link);"
+    "}})();</script>"
+)
+
+_FALLBACK_ANCHOR_TMPL = (
+    '<a href="{url}" target="_blank" style="display:inline-block;'
+    'padding:12px 24px;background-color:#ff4b4b;color:white;'
+    'text-decoration:none;border-radius:5px;font-weight:bold;'
+    'font-size:18px;">{label}</a>'
+)
+
+# Countdown rendered entirely in the browser: a local JS timer updates
+# the text four times a second, so the backend ships this component once
+# per trigger instead of rerunning Python every second just to redraw a
+# number. Status is injected as a JSON literal so quotes can't break the
+# script.
+_COUNTDOWN_HTML_TMPL = (
+    "<div id='cd' style='font-family:\"Source Sans Pro\",sans-serif;"
+    "padding:8px 12px;background-color:#e8f0fe;border-radius:6px;"
+    "color:#31333F;'></div>"
+    "<script>"
+    "const end={end_ms};"
+    "function t(){{"
+    "const s=Math.max(0,Math.round((end-Date.now())/1000));"
+    "document.getElementById('cd').textContent="
+    "'⏳ Next action in: '+s+' s | Status: '+{status_json};"
+    "}}"
+    "setInterval(t,250);t();"
+    "</script>"
+)
+
+
+def celebrate_once():
+    """st.balloons at most once per session.
+
+    The balloons animation streams a sizeable canvas payload to every
+    connected client; firing it on each repeat press is pure cost, so
+    keep the celebration for the first success only.
+    """
+    if not st.session_state.get('_celebrated'):
+        st.session_state._celebrated = True
+        st.balloons()
+
+
+def open_url_new_tab(url, fallback_label="📱 CLICK TO OPEN PAGE", cloud=None):
+    """Open a URL in a new browser tab from an auto-refresh tick.
+
+    Locally this is a plain webbrowser.open; on Streamlit Cloud the
+    server has no browser, so a programmatic anchor click is injected
+    client-side with a styled fallback link for when the popup blocker
+    eats it.
+
+    Args:
+        url: The URL to open
+        fallback_label: Text for the popup-blocked fallback link
+        cloud: Override the environment detection (useful in tests);
+            None means use the import-time result
+    """
+    if cloud is None:
+        cloud = _IS_STREAMLIT_CLOUD
+    if cloud:
+        components.html(
+            _AUTO_CLICK_HTML_TMPL.format(url_json=json.dumps(url)),
+            height=0,
+        )
+        st.warning("🚨 **If no tab opened (popup blocked), click here:**")
+        st.markdown(
+            _FALLBACK_ANCHOR_TMPL.format(
+                url=html.escape(url, quote=True),
+                label=fallback_label,
+            ),
+            unsafe_allow_html=True,
+        )
+    else:
+        webbrowser.open(url, new=2)
+        st.toast("🔄 Opened new tab", icon="✅")
+
+
+def render_countdown(deadline, status):
+    """Render the client-side countdown to an absolute deadline.
+
+    Args:
+        deadline: Unix timestamp (seconds) of the next action
+        status: Status text appended after the countdown
+    """
+    components.html(
+        _COUNTDOWN_HTML_TMPL.format(
+            end_ms=int(deadline * 1000),
+            status_json=json.dumps(status),
+        ),
+        height=44,
+    )
@@ -6,14 +6,16 @@ including taking screenshots and parsing HTML for structured content.
 """
 
 import asyncio
+import atexit
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Set
 import logging
 
 try:
     from playwright.async_api import async_playwright
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 except ImportError:
     raise ImportError("playwright is required. Install it with: pip install playwright")
 
@@ -24,54 +26,183 @@ logger = logging.getLogger(__name__)
 class WebContentExtractor:
     """Extracts clean content from web pages using Playwright."""
     
-    def __init__(self, screenshots_dir: str = "screenshots"):
+    # Resource types that are never needed for text extraction. Images and
+    # stylesheets are kept by default so screenshots still look right; add
+    # them to block_resources when only text matters.
+    DEFAULT_BLOCKED_RESOURCES: Set[str] = {"media", "font"}
+
+    # Default location of a saved login session (see local/save_brs_session.py)
+    DEFAULT_STORAGE_STATE = "session/state.json"
+
+    def __init__(
+        self,
+        screenshots_dir: str = "screenshots",
+        wait_until: str = "domcontentloaded",
+        block_resources: Optional[Set[str]] = None,
+        full_page: bool = False,
+        screenshot_quality: int = 70,
+        storage_state: Optional[str] = None,
+    ):
         """
         Initialize the extractor.
-        
+
         Args:
             screenshots_dir: Directory to save screenshots to
+            wait_until: Playwright navigation wait state. Defaults to
+                "domcontentloaded" — the DOM is queryable long before
+                "networkidle", which can stall 10-30s on pages with
+                chatty analytics. Lazy-loaded content may be missed;
+                pass "networkidle" to restore the old behavior.
+            block_resources: Playwright resource types to abort during
+                navigation (e.g. {"image", "media", "font", "stylesheet"}).
+                Defaults to media and fonts, which cuts bandwidth without
+                affecting screenshots. Pass an empty set to disable.
+            full_page: Capture the entire scroll height instead of just
+                the viewport. Off by default — full-page PNGs of long
+                pages routinely run 5-20 MB and dominate extraction time.
+            screenshot_quality: JPEG quality (1-100) for screenshots.
+            storage_state: Path to a Playwright storage-state JSON
+                (cookies + localStorage) so extractions run logged-in —
+                e.g. the file written by local/save_brs_session.py. When
+                omitted, DEFAULT_STORAGE_STATE is picked up if present.
         """
+        if storage_state is None and Path(self.DEFAULT_STORAGE_STATE).exists():
+            storage_state = self.DEFAULT_STORAGE_STATE
+        self.storage_state = storage_state
+        self.wait_until = wait_until
+        self.full_page = full_page
+        self.screenshot_quality = screenshot_quality
+        self.block_resources = (
+            set(block_resources) if block_resources is not None
+            else set(self.DEFAULT_BLOCKED_RESOURCES)
+        )
         self.screenshots_dir = Path(screenshots_dir)
         self.screenshots_dir.mkdir(exist_ok=True)
-    
+        # Long-lived Playwright/browser instances, started lazily on first use.
+        # Launching Chromium costs 1-3s, so we keep the browser alive across
+        # extractions and only create a fresh context+page per URL.
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+
+    async def _ensure_browser(self):
+        """
+        Start Playwright and launch the browser if not already running.
+
+        Returns:
+            The long-lived Browser instance
+        """
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+        return self._browser
+
+    async def aclose(self):
+        """Close the browser and stop Playwright."""
+        async with self._browser_lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
     async def extract_clean_content(self, url: str) -> Dict[str, Any]:
         """
         Extract and clean content from a URL.
-        
+
         Args:
             url: The URL to extract content from
-            
+
         Returns:
             Dictionary containing extracted content and metadata
         """
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            
+        browser = await self._ensure_browser()
+        context = await browser.new_context(
+            device_scale_factor=1,
+            storage_state=self.storage_state,
+        )
+
+        # Bound tail latency: one stuck request must not hold the session
+        # for the library-default 30s
+        context.set_default_navigation_timeout(8000)
+        context.set_default_timeout(3000)
+
+        # Abort requests for resource types we don't need; pages routinely
+        # download megabytes of media before firing load events
+        if self.block_resources:
+            await context.route(
+                "**/*",
+                lambda route: (
+                    route.abort()
+                    if route.request.resource_type in self.block_resources
+                    else route.continue_()
+                ),
+            )
+
+        page = await context.new_page()
+
+        try:
+            # Navigate to the URL; on timeout, soft-fail and extract
+            # whatever DOM has arrived rather than erroring the session
             try:
-                # Navigate to the URL
-                await page.goto(url, wait_until="networkidle")
-                
-                # Take a screenshot
-                screenshot_path = await self._take_screenshot(page, url)
-                
-                # Extract content
-                clean_data = await self._extract_content(page, url)
-                
-                return {
-                    "url": url,
-                    "screenshot_path": screenshot_path,
-                    "clean_data": clean_data,
-                    "extracted_at": datetime.now().isoformat(),
-                }
-            
-            except Exception as e:
-                logger.error(f"Error extracting content from {url}: {e}")
-                raise
-            
-            finally:
-                await browser.close()
+                await page.goto(url, wait_until=self.wait_until)
+            except PlaywrightTimeoutError:
+                logger.warning(f"Navigation to {url} timed out; extracting partial content")
+
+            # Give subresources a bounded chance to finish; don't fail if slow
+            if self.wait_until == "domcontentloaded":
+                try:
+                    await page.wait_for_load_state("load", timeout=5000)
+                except Exception:
+                    pass
+
+            # Take a screenshot
+            screenshot_path = await self._take_screenshot(page, url)
+
+            # Extract content
+            clean_data = await self._extract_content(page, url)
+
+            return {
+                "url": url,
+                "screenshot_path": screenshot_path,
+                "clean_data": clean_data,
+                "extracted_at": datetime.now().isoformat(),
+            }
+
+        except Exception as e:
+            logger.error(f"Error extracting content from {url}: {e}")
+            raise
+
+        finally:
+            # Close only the context; the browser stays warm for the next call
+            await context.close()
     
+    async def extract_many(self, urls: List[str], concurrency: int = 8) -> List[Any]:
+        """
+        Extract content from several URLs concurrently.
+
+        Each URL gets its own BrowserContext on the shared browser, so
+        extractions run in parallel tabs. Chromium handles ~10-20
+        concurrent tabs well; beyond that, launches start to contend.
+
+        Args:
+            urls: The URLs to extract content from
+            concurrency: Maximum number of URLs processed at once
+
+        Returns:
+            List of result dictionaries in input order; failed URLs
+            yield the raised exception in their slot
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(url: str):
+            async with sem:
+                return await self.extract_clean_content(url)
+
+        return await asyncio.gather(*(_one(u) for u in urls), return_exceptions=True)
+
     async def _take_screenshot(self, page, url: str) -> str:
         """
         Take a screenshot of the page.
@@ -83,130 +214,104 @@ class WebContentExtractor:
         Returns:
             Path to the saved screenshot
         """
-        # Create a filename from the URL
-        filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+        # JPEG encodes far faster than PNG deflate and is ~10x smaller
+        filename = f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
         filepath = self.screenshots_dir / filename
-        
-        await page.screenshot(path=str(filepath), full_page=True)
+
+        await page.screenshot(
+            path=str(filepath),
+            full_page=self.full_page,
+            type="jpeg",
+            quality=self.screenshot_quality,
+        )
         return str(filepath)
     
+    # Single-pass DOM extraction executed in the browser. One evaluate call
+    # replaces ~45 per-element round trips over the driver websocket.
+    _EXTRACT_JS = """
+    () => ({
+        title: document.title,
+        h1: [...document.querySelectorAll('h1')]
+            .map(e => e.textContent.trim())
+            .filter(Boolean),
+        h2: [...document.querySelectorAll('h2')].slice(0, 10)
+            .map(e => e.textContent.trim())
+            .filter(Boolean),
+        p: [...document.querySelectorAll('p')].slice(0, 15)
+            .map(e => e.textContent.trim())
+            .filter(t => t.length > 20),
+        links: [...document.querySelectorAll('a[href]')].slice(0, 20)
+            .map(a => ({text: a.textContent.trim(), url: a.getAttribute('href')}))
+            .filter(l => l.text && l.url)
+    })
+    """
+
     async def _extract_content(self, page, url: str) -> Dict[str, Any]:
         """
         Extract structured content from the page.
-        
+
         Args:
             page: Playwright page object
             url: URL being parsed
-            
+
         Returns:
             Dictionary with title, main content, and links
         """
-        # Extract title
-        title = await page.title()
-        
-        # Extract main content
-        main_content = await self._extract_main_content(page)
-        
-        # Extract links
-        links = await self._extract_links(page)
-        
+        try:
+            data = await page.evaluate(self._EXTRACT_JS)
+        except Exception as e:
+            logger.warning(f"Error extracting content: {e}")
+            data = {"title": await page.title(), "h1": [], "h2": [], "p": [], "links": []}
+
+        main_content: List[Dict[str, str]] = []
+        for tag in ("h1", "h2", "p"):
+            main_content.extend({"type": tag, "text": text} for text in data[tag])
+
         return {
-            "title": title,
+            "title": data["title"],
             "url": url,
             "main_content": main_content,
-            "links": links,
+            "links": data["links"],
         }
-    
-    async def _extract_main_content(self, page) -> List[Dict[str, str]]:
-        """
-        Extract main content (headings, paragraphs, etc.).
-        
-        Args:
-            page: Playwright page object
-            
-        Returns:
-            List of content items with type and text
-        """
-        content = []
-        
-        try:
-            # Extract headings
-            h1_elements = await page.query_selector_all("h1")
-            for elem in h1_elements:
-                text = await elem.text_content()
-                if text and text.strip():
-                    content.append({"type": "h1", "text": text.strip()})
-            
-            h2_elements = await page.query_selector_all("h2")
-            for elem in h2_elements[:10]:  # Limit to first 10
-                text = await elem.text_content()
-                if text and text.strip():
-                    content.append({"type": "h2", "text": text.strip()})
-            
-            # Extract paragraphs
-            p_elements = await page.query_selector_all("p")
-            for elem in p_elements[:15]:  # Limit to first 15
-                text = await elem.text_content()
-                if text and text.strip() and len(text.strip()) > 20:  # Minimum length
-                    content.append({"type": "p", "text": text.strip()})
-        
-        except Exception as e:
-            logger.warning(f"Error extracting main content: {e}")
-        
-        return content
-    
-    async def _extract_links(self, page) -> List[Dict[str, str]]:
-        """
-        Extract links from the page.
-        
-        Args:
-            page: Playwright page object
-            
-        Returns:
-            List of links with text and URL
-        """
-        links = []
-        
-        try:
-            a_elements = await page.query_selector_all("a[href]")
-            for elem in a_elements[:20]:  # Limit to first 20
-                href = await elem.get_attribute("href")
-                text = await elem.text_content()
-                
-                if href and text and text.strip():
-                    links.append({
-                        "text": text.strip(),
-                        "url": href,
-                    })
-        
-        except Exception as e:
-            logger.warning(f"Error extracting links: {e}")
-        
-        return links
 
 
 # Global extractor instance
 _extractor = None
 
 
+def get_extractor() -> WebContentExtractor:
+    """Return the shared extractor instance, creating it on first use."""
+    global _extractor
+
+    if _extractor is None:
+        _extractor = WebContentExtractor()
+
+    return _extractor
+
+
 async def extract_clean_content(url: str) -> Dict[str, Any]:
     """
     Extract clean content from a URL.
-    
+
     This is the main entry point for content extraction.
-    
+
     Args:
         url: The URL to extract content from
-        
+
     Returns:
         Dictionary containing extracted content, screenshots, and metadata
     """
-    global _extractor
-    
-    if _extractor is None:
-        _extractor = WebContentExtractor()
-    
-    return await _extractor.extract_clean_content(url)
+    return await get_extractor().extract_clean_content(url)
+
+
+@atexit.register
+def _shutdown_extractor():
+    """Close the shared extractor's browser on interpreter exit."""
+    if _extractor is not None:
+        try:
+            asyncio.run(_extractor.aclose())
+        except Exception:
+            pass  # Event loop may already be gone at shutdown
 
 
 if __name__ == "__main__":
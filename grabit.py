@@ -1,6 +1,42 @@
+import requests
 import streamlit as st
 from streamlit.components.v1 import iframe
 
+
+@st.cache_resource
+def get_session():
+    """Shared requests.Session so polls reuse the same TCP+TLS connection."""
+    s = requests.Session()
+    s.headers['User-Agent'] = (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+        '(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36'
+    )
+    return s
+
+
+def page_changed(url):
+    """Conditional GET: has the page changed since we last looked?
+
+    Sends If-None-Match with the ETag recorded on the previous poll.
+    A 304 means the tee sheet is byte-identical and the iframe reload
+    can be skipped entirely. Returns True (assume changed) when the
+    server doesn't support validators or the probe fails.
+    """
+    etags = st.session_state.setdefault('page_etags', {})
+    headers = {}
+    if url in etags:
+        headers['If-None-Match'] = etags[url]
+    try:
+        resp = get_session().get(url, headers=headers, timeout=5, allow_redirects=True)
+    except requests.RequestException:
+        return True
+    if resp.status_code == 304:
+        return False
+    if 'ETag' in resp.headers:
+        etags[url] = resp.headers['ETag']
+    return True
+
+
 st.title("BRS Golf Auto Reloader")
 
 # Initialize session state for iframe refresh counters
@@ -41,11 +77,15 @@ if user_url and reload_enabled:
     st.success(f"Auto-reload enabled! This page will refresh every {interval} seconds.")
     # Streamlit reruns script on every interaction; use st.experimental_rerun in combination
 
-    # Add refresh button for tee sheet iframe
+    # Add refresh button for tee sheet iframe; skip the reload when a
+    # conditional GET says the page hasn't changed since the last poll
     col1, col2 = st.columns([1, 4])
     with col1:
         if st.button("🔄 Refresh Page", key="refresh_teesheet_btn"):
-            st.session_state.teesheet_refresh += 1
+            if page_changed(user_url):
+                st.session_state.teesheet_refresh += 1
+            else:
+                st.info("Page unchanged - reload skipped")
 
     st.write(f"Preview of: {user_url}")
     # Add cache-busting parameter to force iframe reload
@@ -1,12 +1,30 @@
 import streamlit as st
-import streamlit.components.v1 as components
+import pandas as pd
 import webbrowser
 import time
 import os
 import platform
 import json
 import asyncio
+import atexit
+import hashlib
+import logging
+import sys
+import threading
+from contextlib import asynccontextmanager
 from io import BytesIO
+from pathlib import Path
+
+# Shared page helpers live at the repo root; streamlit run only puts
+# this script's own directory on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from autorefresh import celebrate_once
+
+# Debug output goes through logging so the hot paths don't pay for
+# string formatting (or fight Streamlit's log stream) unless the level
+# is turned on, e.g. GRABIT_LOG=DEBUG
+logger = logging.getLogger("grabit.playwright")
+logger.setLevel(os.getenv("GRABIT_LOG", "INFO"))
 
 # Fix Windows asyncio issues
 if platform.system() == 'Windows':
@@ -18,71 +36,381 @@ try:
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
-# Environment detection
-def is_streamlit_cloud():
+# Environment detection, done once at import: the answer can't change at
+# runtime and platform.processor() can spawn a subprocess on some
+# platforms, which this UI would otherwise repeat on every rerun
+def _detect_streamlit_cloud():
     """Detect if running on Streamlit Cloud vs local development"""
     # Streamlit Cloud runs on Linux with empty processor string
     # Also check for 'appuser' which is the default Streamlit Cloud user
     return platform.processor() == '' or os.getenv('USER') == 'appuser'
 
+
+_IS_STREAMLIT_CLOUD = _detect_streamlit_cloud()
+
+
+def is_streamlit_cloud():
+    """Return the import-time Streamlit Cloud detection result"""
+    return _IS_STREAMLIT_CLOUD
+
 # ============================================================================
 # Playwright Browser Automation
 # ============================================================================
 
-def check_playwright_available():
-    """Check if Playwright is available"""
-    return PLAYWRIGHT_AVAILABLE
+# Clickable-element scan, preloaded once per context as an init script so
+# each scan only ships the tiny "window.__grabitScan()" call over CDP and
+# V8 keeps the compiled function warm across scans. Replaces the old
+# Python-side loop that awaited text_content/get_attribute/is_visible per
+# element (4+ driver round trips each). Candidates without an id are
+# tagged with data-grabit-id, the same stable O(1) attribute-selector
+# scheme as the scan in qiangpiaowang.py.
+# Everything the scan treats as clickable. Broad on purpose: missing
+# categories (onclick handlers, ARIA widgets, summary/label) meant users
+# re-scanned pages hunting for buttons the scan never reported.
+_CLICKABLE_SELECTOR = ", ".join([
+    'button',
+    'a[href]',
+    'input[type="submit"]',
+    'input[type="button"]',
+    'input[type="image"]',
+    '[role="button"]',
+    '[role="link"]',
+    '[role="menuitem"]',
+    '[onclick]',
+    'summary',
+    'label[for]',
+])
+
+_SCAN_FN_JS = """
+() => {
+    const elems = [...document.querySelectorAll(__CLICKABLE_SELECTOR__)];
+    // Batch all geometry reads up front: one layout flush for the whole
+    // list instead of a forced reflow per element (read-then-write order)
+    const rects = elems.map(e => e.getBoundingClientRect());
+    // Filter invisible candidates here rather than in Python: on heavy
+    // SPAs they are often the majority of matches, and dropping them
+    // before serialization shrinks the JSON crossing the CDP websocket
+    return elems.map((el, i) => {
+        const visible = rects[i].width > 0 && rects[i].height > 0 &&
+            (!el.checkVisibility ||
+             el.checkVisibility({checkOpacity: true, checkVisibilityCSS: true}));
+        if (!visible) return null;
+        const text = (el.textContent || el.value || '').trim().substring(0, 80) || `Element ${i+1}`;
+        // Prefer selectors that survive a page reload: id, then stable
+        // attributes the page itself ships. Each candidate must match
+        // exactly this one element — an ambiguous selector makes the
+        // click land on the wrong element and burn the whole wait
+        // timeout. The synthetic data-grabit-id is the unique-by-
+        // construction fallback, last because it vanishes when the DOM
+        // is rebuilt.
+        const esc = (v) => v.replace(/"/g, '\\\\"');
+        const unique = (sel) => {
+            try {
+                const found = document.querySelectorAll(sel);
+                return found.length === 1 && found[0] === el;
+            } catch (err) { return false; }
+        };
+        const tag = el.tagName.toLowerCase();
+        const candidates = [];
+        if (el.id) candidates.push(`#${CSS.escape(el.id)}`);
+        if (el.dataset && el.dataset.testid) candidates.push(`[data-testid="${esc(el.dataset.testid)}"]`);
+        if (el.getAttribute('aria-label')) candidates.push(`${tag}[aria-label="${esc(el.getAttribute('aria-label'))}"]`);
+        if (el.getAttribute('name')) candidates.push(`${tag}[name="${esc(el.getAttribute('name'))}"]`);
+        let selector = candidates.find(unique);
+        if (!selector) {
+            el.setAttribute('data-grabit-id', i);
+            selector = `[data-grabit-id="${i}"]`;
+        }
+        // Only fields the UI actually renders; full attribute strings on
+        // framework sites run to hundreds of chars per element and sit in
+        // session state, repickled on every rerun
+        return {
+            text: text,
+            selector: selector,
+            enabled: !el.disabled && !el.hasAttribute('disabled'),
+            type: el.tagName,
+            id: el.id || '',
+            class: (typeof el.className === 'string' ? el.className.substring(0, 40) : '')
+        };
+    }).filter(Boolean);
+}
+"""
+
+# json.dumps gives a valid JS string literal, quotes and all
+_SCAN_FN_JS = _SCAN_FN_JS.replace("__CLICKABLE_SELECTOR__", json.dumps(_CLICKABLE_SELECTOR))
+
+
+def _compact_js(src):
+    """Strip comment lines and indentation from a JS snippet.
+
+    Done once at import so the annotated source above stays readable
+    while the bytes shipped to the browser with every new context (and
+    every inline-fallback evaluate) are roughly halved.
+    """
+    return "\n".join(
+        stripped
+        for line in src.splitlines()
+        if (stripped := line.strip()) and not stripped.startswith("//")
+    )
 
-def run_async(coro):
-    """Run async function in sync context for Streamlit"""
-    # Use persistent event loop if browser session is active
-    if st.session_state.get('browser_active') and st.session_state.get('event_loop'):
-        loop = st.session_state.event_loop
-
-        # Validate loop is usable
-        if loop.is_closed():
-            print("[ERROR] Event loop is closed! Creating new temporary loop.")
-            # Fall back to temporary loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+
+_SCAN_FN_JS_MIN = _compact_js(_SCAN_FN_JS)
+_SCAN_INIT_JS = f"window.__grabitScan = {_SCAN_FN_JS_MIN};"
+
+
+class _BrowserPool:
+    """Shared headless Chromium for operations without a login session.
+
+    The temporary path used to start Playwright and launch Chromium per
+    call (~2-3s each); the pool launches once, keeps the browser warm,
+    and hands out a fresh context+page per operation. The browser is
+    recycled after MAX_USES_PER_INSTANCE acquisitions to bound memory
+    creep from a long-lived Chromium.
+    """
+
+    MAX_USES_PER_INSTANCE = int(os.getenv("BROWSER_POOL_RECYCLE_AFTER", "100"))
+    MAX_CACHED_CONTEXTS = int(os.getenv("BROWSER_POOL_CONTEXTS", "4"))
+
+    # Fast mode: pages on media-heavy sites spend most of their load time
+    # downloading and decoding resources the auto-clicker never looks at.
+    # Chromium skips image decode entirely with the blink setting; the
+    # route filter stops the remaining bytes at the network layer.
+    # /dev/shm is tiny in containers (Streamlit Cloud, Docker) and
+    # Chromium crashes tabs when it fills; spill to /tmp instead.
+    # GPU and the listed features are dead weight for headless scraping.
+    BASE_ARGS = [
+        "--disable-dev-shm-usage",
+        "--disable-gpu",
+        "--disable-features=Translate,MediaRouter,BackForwardCache",
+    ]
+    FAST_MODE_ARGS = [
+        "--blink-settings=imagesEnabled=false",
+        "--disable-features=IsolateOrigins,site-per-process",
+    ]
+    FAST_MODE_BLOCKED = {"image", "font", "media", "stylesheet"}
+
+    def __init__(self):
+        self._playwright = None
+        self._browser = None
+        self._lock = None
+        self._uses = 0
+        # Warm contexts keyed by storage-state hash: rebuilding a context
+        # reparses cookies/localStorage, ~50-200ms per call
+        self._contexts = {}
+        # Toggled from the UI; the browser relaunches on the next acquire
+        # when it was launched with a different setting
+        self.fast_mode = False
+        self._launched_fast_mode = False
+        # Backpressure: rage-clicking Scan/Click must queue, not spawn
+        # unbounded concurrent operations on the host
+        self.max_concurrent = 2
+        self._sem = None
+        self._sem_limit = None
+
+    async def _ensure_browser(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._browser is not None and (
+                not self._browser.is_connected()
+                or self._uses >= self.MAX_USES_PER_INSTANCE
+                or self._launched_fast_mode != self.fast_mode
+            ):
+                await self._close_unlocked()
+            if self._browser is None:
+                self._playwright = await async_playwright().start()
+                args = self.BASE_ARGS + (self.FAST_MODE_ARGS if self.fast_mode else [])
+                try:
+                    # headless-shell is a stripped build (~4x smaller, no
+                    # GPU worker) — use it when installed via
+                    # `playwright install chromium-headless-shell`
+                    self._browser = await self._playwright.chromium.launch(
+                        channel="chromium-headless-shell", args=args,
+                    )
+                except Exception:
+                    self._browser = await self._playwright.chromium.launch(
+                        headless=True, args=args,
+                    )
+                self._launched_fast_mode = self.fast_mode
+                self._uses = 0
+            self._uses += 1
+        return self._browser
+
+    @asynccontextmanager
+    async def acquire(self, storage_state=None):
+        """Yield a fresh Page on the warm context for this storage_state.
+
+        At most max_concurrent operations run at once; the rest wait on
+        the semaphore, so a burst of clicks queues instead of piling
+        concurrent page loads onto the host.
+        """
+        if self._sem is None or self._sem_limit != self.max_concurrent:
+            # Rebuilt when the UI changes the limit; in-flight waiters
+            # finish against the semaphore they queued on
+            self._sem = asyncio.Semaphore(self.max_concurrent)
+            self._sem_limit = self.max_concurrent
+        async with self._sem:
+            browser = await self._ensure_browser()
+            context = await self._get_context(browser, storage_state)
+            page = await context.new_page()
             try:
-                return loop.run_until_complete(coro)
+                yield page
             finally:
-                loop.close()
-
-        if loop.is_running():
-            print("[ERROR] Event loop is already running! This shouldn't happen in Streamlit.")
-            raise RuntimeError("Cannot run async function: event loop is already running")
+                # Close only the page; the context stays warm for the next call
+                await page.close()
 
-        print(f"[DEBUG] Reusing persistent event loop (closed={loop.is_closed()}, running={loop.is_running()})")
-        asyncio.set_event_loop(loop)
+    async def _get_context(self, browser, storage_state):
+        if storage_state:
+            key = hashlib.sha1(
+                json.dumps(storage_state, sort_keys=True, default=str).encode()
+            ).hexdigest()
+        else:
+            key = "__none__"
+
+        context = self._contexts.get(key)
+        if context is None:
+            # Evict the oldest cached context when full (insertion order)
+            if len(self._contexts) >= self.MAX_CACHED_CONTEXTS:
+                old_key = next(iter(self._contexts))
+                old_context = self._contexts.pop(old_key)
+                try:
+                    await old_context.close()
+                except Exception:
+                    pass
+            if storage_state:
+                context = await browser.new_context(storage_state=storage_state)
+            else:
+                context = await browser.new_context()
+            await context.add_init_script(_SCAN_INIT_JS)
+            if self.fast_mode:
+                # Abort non-document requests before any bytes transfer;
+                # the main document always passes (its type is "document")
+                await context.route(
+                    "**/*",
+                    lambda r: (
+                        r.abort()
+                        if r.request.resource_type in self.FAST_MODE_BLOCKED
+                        else r.continue_()
+                    ),
+                )
+            self._contexts[key] = context
+        return context
+
+    async def _close_unlocked(self):
         try:
-            return loop.run_until_complete(coro)
-        except Exception as e:
-            print(f"[ERROR] Failed to run async function on persistent loop: {e}")
-            raise
-    else:
-        # Create temporary event loop for one-off operations
-        print("[DEBUG] Creating temporary event loop for one-off operation")
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+            if self._browser is not None:
+                await self._browser.close()
+            if self._playwright is not None:
+                await self._playwright.stop()
+        except Exception:
+            pass
+        self._browser = None
+        self._playwright = None
+        self._contexts = {}
+
+    async def aclose(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            await self._close_unlocked()
+
+
+_pool = _BrowserPool()
+
+
+class _PersistentSession:
+    """Registry for the headed login browser (playwright/browser/context/page).
+
+    These objects live on the worker loop, so the coroutines there must
+    reach them without going through st.session_state: Streamlit resolves
+    st.session_state via the current thread's ScriptRunContext, and the
+    grabit-asyncio thread has none — reads raise AttributeError and
+    writes land in a throwaway SessionState object. Module attributes
+    are visible from both threads, and like the pool and the loop they
+    are per-process: there is at most one headed login browser, owned by
+    the single worker loop.
+    """
+
+    def __init__(self):
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.active = False
+
+    def reset(self):
+        """Clear every reference in one go.
+
+        Setting active False first means no concurrent reader ever
+        observes the half-reset state where the session still looks
+        active but the page is already gone.
+        """
+        self.active = False
+        self.page = None
+        self.context = None
+        self.browser = None
+        self.playwright = None
+
+
+_persistent = _PersistentSession()
+
+
+class _LoopThread(threading.Thread):
+    """Daemon thread owning the single process-wide asyncio loop.
+
+    All Playwright objects (pool browser, persistent login session) live
+    on this one loop, so they stay valid across Streamlit reruns. The
+    old scheme of building and closing a loop per call paid setup/
+    teardown on every interaction and risked 'Event loop is closed'
+    errors on objects bound to a dead loop.
+    """
+
+    def __init__(self):
+        super().__init__(daemon=True, name="grabit-asyncio")
+        self.loop = asyncio.new_event_loop()
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro, timeout=None):
+        """Run a coroutine on the loop and block until it finishes"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+
+_loop_thread = None
+
+
+def _get_loop_thread():
+    global _loop_thread
+    if _loop_thread is None or not _loop_thread.is_alive():
+        _loop_thread = _LoopThread()
+        _loop_thread.start()
+    return _loop_thread
+
+
+@atexit.register
+def _shutdown_pool():
+    """Best-effort close of the pooled browser at interpreter exit"""
+    if _pool._browser is not None and _loop_thread is not None and _loop_thread.is_alive():
         try:
-            return loop.run_until_complete(coro)
-        finally:
-            loop.close()
+            _loop_thread.submit(_pool.aclose(), timeout=10)
+        except Exception:
+            pass
+
+
+def run_async(coro):
+    """Run async function in sync context for Streamlit"""
+    return _get_loop_thread().submit(coro)
 
 async def _navigate_to_page_async(url):
     """Navigate to a URL using Playwright (async)"""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+    async with _pool.acquire() as page:
         try:
-            await page.goto(url, wait_until="networkidle", timeout=30000)
+            await page.goto(url, wait_until="domcontentloaded", timeout=15000)
             return True, "Navigation successful"
         except Exception as e:
             return False, f"Navigation failed: {str(e)}"
-        finally:
-            await browser.close()
 
 def navigate_to_page(url):
     """Navigate to a URL using Playwright"""
@@ -91,208 +419,280 @@ def navigate_to_page(url):
     except Exception as e:
         return False, f"Navigation failed: {str(e)}"
 
+# Guards the persistent login page so concurrent operations don't
+# interleave goto/click on it; created lazily on the worker loop
+_persistent_page_lock = None
+
+
+@asynccontextmanager
+async def _acquired_page(storage_state=None, operation=""):
+    """Yield the page to run one operation on.
+
+    The single seam deciding between the persistent login page (when a
+    browser session is active) and a pooled tab, so the four operation
+    helpers share one audited acquire/cleanup path instead of each
+    carrying its own copy.
+    """
+    global _persistent_page_lock
+    if _persistent.active and _persistent.page is not None:
+        if _persistent_page_lock is None:
+            _persistent_page_lock = asyncio.Lock()
+        if not _persistent_page_lock.locked():
+            async with _persistent_page_lock:
+                logger.debug("Using persistent browser session for %s", operation)
+                yield _persistent.page
+        else:
+            # The shared page is mid-operation; a sibling tab on the same
+            # logged-in context keeps the cookies without queueing behind
+            # it or clobbering its navigation state
+            logger.debug("Persistent page busy - sibling tab for %s", operation)
+            page = await _persistent.context.new_page()
+            try:
+                yield page
+            finally:
+                await page.close()
+    else:
+        logger.debug("Using pooled browser for %s", operation)
+        async with _pool.acquire(storage_state) as page:
+            yield page
+
+
 async def _scan_clickable_elements_async(url, storage_state=None):
     """Scan page for all clickable elements (async) - reuses persistent browser if available"""
-    # Check if we have a persistent browser session
-    use_persistent = st.session_state.browser_active and st.session_state.browser_page is not None
-
-    if use_persistent:
-        # Reuse existing browser page
-        page = st.session_state.browser_page
-        temp_playwright = None
-        temp_browser = None
-        temp_context = None
-        print(f"[DEBUG] Using persistent browser session for scanning: {url}")
-    else:
-        # Create temporary browser for this operation
-        print(f"[DEBUG] Creating temporary browser for scanning: {url}")
-        temp_playwright = await async_playwright().start()
-        temp_browser = await temp_playwright.chromium.launch(headless=True)
+    async with _acquired_page(storage_state, f"scanning: {url}") as page:
+        return await _scan_on_page(page, url)
+
+
+# The scan only reads the DOM; these resource types are pure download
+# weight for it. Stylesheets stay — the visibility checks need layout.
+_SCAN_BLOCKED_RESOURCES = {"image", "media", "font"}
 
-        if storage_state:
-            temp_context = await temp_browser.new_context(storage_state=storage_state)
-        else:
-            temp_context = await temp_browser.new_context()
 
-        page = await temp_context.new_page()
+async def _scan_on_page(page, url):
+    """Run the clickable-element scan on an already-open page"""
+    def _block(route):
+        if route.request.resource_type in _SCAN_BLOCKED_RESOURCES:
+            return route.abort()
+        return route.continue_()
 
     try:
-        await page.goto(url, wait_until="networkidle", timeout=30000)
-
-        # Find all clickable elements
-        elements = await page.query_selector_all('button, a, input[type="submit"], input[type="button"], [role="button"]')
-
-        result = []
-        for i, elem in enumerate(elements):
-            # Check if element is visible
-            is_visible = await elem.is_visible()
-            if not is_visible:
-                continue
-
-            # Get element properties
-            text_content = await elem.text_content()
-            value = await elem.get_attribute('value')
-            elem_id = await elem.get_attribute('id')
-            elem_class = await elem.get_attribute('class')
-            tag_name = await elem.evaluate('el => el.tagName')
-            is_disabled = await elem.is_disabled()
-
-            # Get text
-            text = (text_content or value or '').strip()[:80] or f"Element {i+1}"
-
-            # Generate selector (prefer ID, then class, then nth-of-type)
-            if elem_id:
-                selector = f"#{elem_id}"
-            elif elem_class and elem_class.strip():
-                first_class = elem_class.strip().split()[0]
-                selector = f".{first_class}"
-            else:
-                selector = f"{tag_name.lower()}:nth-of-type({i+1})"
-
-            result.append({
-                'index': i,
-                'text': text,
-                'selector': selector,
-                'enabled': not is_disabled,
-                'visible': True,
-                'type': tag_name,
-                'id': elem_id or '',
-                'class': elem_class or ''
-            })
+        # Scans never render, so always skip images/media/fonts here
+        # (independent of the opt-in fast mode). Unrouted afterwards so a
+        # persistent page still loads visuals for later screenshots.
+        try:
+            await page.route("**/*", _block)
+        except Exception:
+            pass
+
+        # domcontentloaded: networkidle adds a hard 500ms idle timer and
+        # never fires on pages holding long-poll/WebSocket connections.
+        # Give late scripts a bounded chance to populate the DOM instead.
+        await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+        try:
+            await page.wait_for_load_state("load", timeout=5000)
+        except Exception:
+            pass
+
+        # Single round trip: the preloaded scan function gathers and
+        # filters every element's properties in-browser
+        try:
+            result = await page.evaluate("window.__grabitScan()")
+        except Exception:
+            # Page was opened before the init script existed (e.g. a login
+            # session captured by an older run) — ship the function inline
+            result = await page.evaluate(f"({_SCAN_FN_JS_MIN})()")
 
         return True, result
 
     except Exception as e:
         return False, f"Scan failed: {str(e)}"
+
     finally:
-        # Only close if we created a temporary browser
-        if temp_context:
-            await temp_context.close()
-        if temp_browser:
-            await temp_browser.close()
-        if temp_playwright:
-            await temp_playwright.stop()
-
-def scan_clickable_elements(url, storage_state=None):
+        try:
+            await page.unroute("**/*", _block)
+        except Exception:
+            pass
+
+# Recent scan results keyed by URL (fragment stripped). Streamlit reruns
+# routinely re-trigger the same scan within seconds; serving the cached
+# element list skips a full navigate + DOM walk. Entries expire after
+# SCAN_CACHE_TTL so a page that changes (e.g. a button enabling) is
+# re-scanned soon enough.
+_scan_cache = {}
+SCAN_CACHE_TTL = 60
+SCAN_CACHE_MAX = 100
+
+
+def clear_scan_cache():
+    """Drop all cached scan results"""
+    _scan_cache.clear()
+
+
+def scan_clickable_elements(url, storage_state=None, use_cache=True):
     """Scan page for all clickable elements"""
+    key = url.split('#')[0]
+    if use_cache:
+        entry = _scan_cache.get(key)
+        if entry is not None and time.time() - entry[0] < SCAN_CACHE_TTL:
+            return True, entry[1]
     try:
-        return run_async(_scan_clickable_elements_async(url, storage_state))
+        success, result = run_async(_scan_clickable_elements_async(url, storage_state))
     except Exception as e:
         return False, f"Scan failed: {str(e)}"
-
-async def _click_element_when_ready_async(url, selector, wait_enabled=True, timeout=30, storage_state=None):
+    if success and use_cache:
+        if len(_scan_cache) >= SCAN_CACHE_MAX:
+            # Evict the oldest entry (insertion order)
+            _scan_cache.pop(next(iter(_scan_cache)))
+        _scan_cache[key] = (time.time(), result)
+    return success, result
+
+async def _click_element_when_ready_async(url, selector, wait_enabled=True, timeout=30, storage_state=None, capture_after=False):
     """Click an element on a page, optionally waiting for it to be enabled (async) - reuses persistent browser if available"""
-    # Check if we have a persistent browser session
-    use_persistent = st.session_state.browser_active and st.session_state.browser_page is not None
-
-    if use_persistent:
-        # Reuse existing browser page
-        page = st.session_state.browser_page
-        temp_playwright = None
-        temp_browser = None
-        temp_context = None
-        print(f"[DEBUG] Using persistent browser session for clicking: {url}")
-    else:
-        # Create temporary browser for this operation
-        print(f"[DEBUG] Creating temporary browser for clicking: {url}")
-        temp_playwright = await async_playwright().start()
-        temp_browser = await temp_playwright.chromium.launch(headless=True)
+    async with _acquired_page(storage_state, f"clicking: {url}") as page:
+        return await _click_on_page(page, url, selector, wait_enabled, timeout, capture_after)
 
-        if storage_state:
-            temp_context = await temp_browser.new_context(storage_state=storage_state)
-        else:
-            temp_context = await temp_browser.new_context()
 
-        page = await temp_context.new_page()
+async def _click_on_page(page, url, selector, wait_enabled, timeout, capture_after=False):
+    """Navigate and click on an already-open page.
 
+    Returns (success, message, screenshot_bytes); screenshot_bytes is
+    None unless capture_after is set and the click succeeded.
+    """
     try:
-        # Navigate to the URL
-        await page.goto(url, wait_until="networkidle", timeout=30000)
+        # On auto-refresh ticks the persistent page is usually already on
+        # the target URL: reload instead of a cold goto, keeping the HTTP
+        # cache, JS heap, and service workers warm while still picking up
+        # server-side changes (the button may have just enabled)
+        if page.url != url:
+            # The readiness wait below handles late-arriving elements, so
+            # the navigation itself only needs the DOM to exist
+            await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+        else:
+            await page.reload(wait_until="domcontentloaded", timeout=15000)
 
         if wait_enabled:
-            # Wait for element to be enabled (poll)
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                try:
-                    elem = await page.query_selector(selector)
-                    if elem:
-                        is_visible = await elem.is_visible()
-                        is_disabled = await elem.is_disabled()
-                        if is_visible and not is_disabled:
-                            # Element is ready, click it
-                            await elem.click()
-                            return True, "Element clicked successfully"
-                    await asyncio.sleep(0.5)
-                except:
-                    await asyncio.sleep(0.5)
-
-            return False, f"Element not ready after {timeout} seconds"
+            # Readiness check + click fused into a single in-browser poll.
+            # The old loop cost 3-4 CDP round trips (query/visible/disabled/
+            # click) per 0.5s iteration; wait_for_function re-checks inside
+            # the page on every animation frame (~16ms), so the click lands
+            # within a browser tick of the element becoming ready instead
+            # of up to half a second later.
+            # All generated selectors are plain CSS, so querySelector works.
+            try:
+                await page.wait_for_function(
+                    """(sel) => {
+                        const e = document.querySelector(sel);
+                        if (e && !e.disabled && e.offsetWidth > 0) {
+                            e.click();
+                            return true;
+                        }
+                        return false;
+                    }""",
+                    arg=selector,
+                    timeout=timeout * 1000,
+                    polling="raf",
+                )
+            except Exception:
+                return False, f"Element not ready after {timeout} seconds", None
         else:
-            # Click immediately
-            elem = await page.query_selector(selector)
-            if elem:
-                await elem.click()
-                return True, "Element clicked successfully"
-            else:
-                return False, "Element not found"
+            # Known-good selector: fire a plain DOM click in one evaluate
+            # call. ElementHandle.click runs Playwright's full actionability
+            # stack (visible + stable + hit-target checks) — several CDP
+            # round trips that buy nothing for a selector the scan already
+            # vetted. If the element is missing on a reused page, reload
+            # once and retry.
+            js_click = """(sel) => {
+                const el = document.querySelector(sel);
+                if (!el) return false;
+                el.click();
+                return true;
+            }"""
+            clicked = await page.evaluate(js_click, selector)
+            if not clicked:
+                await page.reload(wait_until="domcontentloaded")
+                clicked = await page.evaluate(js_click, selector)
+            if not clicked:
+                return False, "Element not found", None
+
+        screenshot = None
+        if capture_after:
+            # Confirmation image comes from the just-clicked page — no
+            # second navigation like a separate capture_screenshot call
+            try:
+                await page.wait_for_load_state("domcontentloaded", timeout=5000)
+            except Exception:
+                pass
+            try:
+                screenshot = await page.screenshot(full_page=False, type='jpeg', quality=70)
+            except Exception:
+                screenshot = None
+
+        return True, "Element clicked successfully", screenshot
 
     except Exception as e:
-        return False, f"Click failed: {str(e)}"
-    finally:
-        # Only close if we created a temporary browser
-        if temp_context:
-            await temp_context.close()
-        if temp_browser:
-            await temp_browser.close()
-        if temp_playwright:
-            await temp_playwright.stop()
-
-def click_element_when_ready(url, selector, wait_enabled=True, timeout=30, storage_state=None):
-    """Click an element on a page, optionally waiting for it to be enabled"""
+        return False, f"Click failed: {str(e)}", None
+
+def click_element_when_ready(url, selector, wait_enabled=True, timeout=30, storage_state=None, capture_after=False):
+    """Click an element on a page, optionally waiting for it to be enabled.
+
+    Returns (success, message), or (success, message, screenshot_bytes)
+    when capture_after is True.
+    """
+    try:
+        result = run_async(_click_element_when_ready_async(url, selector, wait_enabled, timeout, storage_state, capture_after))
+    except Exception as e:
+        result = (False, f"Click failed: {str(e)}", None)
+    if capture_after:
+        return result
+    return result[0], result[1]
+
+async def _click_many_async(url, selectors, wait_enabled=True, timeout=30, storage_state=None):
+    """Click several elements concurrently, one pooled tab per selector (async).
+
+    The readiness waits overlap, so N candidates finish in roughly the
+    time of the slowest one instead of the sum of all of them. Each tab
+    comes from _pool.acquire, so at most max_concurrent clicks run at
+    once and the rest queue on the pool semaphore instead of opening an
+    unbounded tab burst.
+    """
+    async def _one(selector):
+        async with _pool.acquire(storage_state) as page:
+            return await _click_on_page(page, url, selector, wait_enabled, timeout)
+
+    return await asyncio.gather(
+        *[_one(selector) for selector in selectors],
+        return_exceptions=True,
+    )
+
+
+def click_elements_when_ready(url, selectors, wait_enabled=True, timeout=30, storage_state=None):
+    """Click several elements concurrently.
+
+    Returns a list of (success, message) in the same order as selectors.
+    """
     try:
-        return run_async(_click_element_when_ready_async(url, selector, wait_enabled, timeout, storage_state))
+        results = run_async(_click_many_async(url, selectors, wait_enabled, timeout, storage_state))
     except Exception as e:
-        return False, f"Click failed: {str(e)}"
+        return [(False, f"Click failed: {str(e)}")] * len(selectors)
+    return [
+        (False, f"Click failed: {str(r)}") if isinstance(r, Exception) else (r[0], r[1])
+        for r in results
+    ]
+
 
 async def _navigate_with_persistent_browser_async(url, storage_state=None):
     """Navigate to URL using persistent browser if available (async) - no clicking"""
-    # Check if we have a persistent browser session
-    use_persistent = st.session_state.browser_active and st.session_state.browser_page is not None
-
-    if use_persistent:
-        # Reuse existing browser page
-        page = st.session_state.browser_page
-        temp_playwright = None
-        temp_browser = None
-        temp_context = None
-        print(f"[DEBUG] Using persistent browser session for navigation: {url}")
-    else:
-        # Create temporary browser for this operation
-        print(f"[DEBUG] Creating temporary browser for navigation: {url}")
-        temp_playwright = await async_playwright().start()
-        temp_browser = await temp_playwright.chromium.launch(headless=True)
+    async with _acquired_page(storage_state, f"navigation: {url}") as page:
+        return await _goto_on_page(page, url)
 
-        if storage_state:
-            temp_context = await temp_browser.new_context(storage_state=storage_state)
-        else:
-            temp_context = await temp_browser.new_context()
-
-        page = await temp_context.new_page()
 
+async def _goto_on_page(page, url):
+    """Navigate an already-open page"""
     try:
-        # Navigate to the URL
-        await page.goto(url, wait_until="networkidle", timeout=30000)
+        await page.goto(url, wait_until="domcontentloaded", timeout=15000)
         return True, "Navigation successful"
     except Exception as e:
         return False, f"Navigation failed: {str(e)}"
-    finally:
-        # Only close if we created a temporary browser
-        if temp_context:
-            await temp_context.close()
-        if temp_browser:
-            await temp_browser.close()
-        if temp_playwright:
-            await temp_playwright.stop()
 
 def navigate_with_persistent_browser(url, storage_state=None):
     """Navigate to URL using persistent browser if available"""
@@ -301,83 +701,79 @@ def navigate_with_persistent_browser(url, storage_state=None):
     except Exception as e:
         return False, f"Navigation failed: {str(e)}"
 
-async def _capture_screenshot_async(url=None, storage_state=None):
+async def _capture_screenshot_async(url=None, storage_state=None, full_page=False, image_type='jpeg', quality=70):
     """Capture a screenshot of a page (async) - reuses persistent browser if available"""
-    # Check if we have a persistent browser session
-    use_persistent = st.session_state.browser_active and st.session_state.browser_page is not None
-
-    if use_persistent:
-        # Reuse existing browser page
-        page = st.session_state.browser_page
-        temp_playwright = None
-        temp_browser = None
-        temp_context = None
-        print(f"[DEBUG] Using persistent browser session for screenshot: {url}")
-    else:
-        # Create temporary browser for this operation
-        print(f"[DEBUG] Creating temporary browser for screenshot: {url}")
-        temp_playwright = await async_playwright().start()
-        temp_browser = await temp_playwright.chromium.launch(headless=True)
+    async with _acquired_page(storage_state, f"screenshot: {url}") as page:
+        return await _screenshot_on_page(page, url, full_page, image_type, quality)
 
-        if storage_state:
-            temp_context = await temp_browser.new_context(storage_state=storage_state)
-        else:
-            temp_context = await temp_browser.new_context()
-
-        page = await temp_context.new_page()
 
+async def _screenshot_on_page(page, url, full_page=False, image_type='jpeg', quality=70):
+    """Screenshot an already-open page, navigating first if a URL is given"""
     try:
-        if url:
-            await page.goto(url, wait_until="networkidle", timeout=30000)
+        # Skip navigation when the page is already showing the target URL
+        # (fragment differences aside) — the persistent page usually is,
+        # right after a click, making the confirmation shot free
+        if url and page.url.split('#')[0] != url.split('#')[0]:
+            # domcontentloaded: networkidle can hang on analytics beacons
+            # long after the page is visually complete
+            await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+            try:
+                await page.wait_for_load_state("load", timeout=5000)
+            except Exception:
+                pass
 
-        screenshot_bytes = await page.screenshot(full_page=True)
+        # Viewport-only JPEG by default: full-page PNG makes Chromium
+        # stitch the whole scroll height and encode 5-20x more bytes
+        screenshot_bytes = await page.screenshot(
+            full_page=full_page,
+            type=image_type,
+            quality=quality if image_type == 'jpeg' else None,
+        )
         return True, screenshot_bytes
     except Exception as e:
         return False, f"Screenshot failed: {str(e)}"
-    finally:
-        # Only close if we created a temporary browser
-        if temp_context:
-            await temp_context.close()
-        if temp_browser:
-            await temp_browser.close()
-        if temp_playwright:
-            await temp_playwright.stop()
-
-def capture_screenshot(url=None, storage_state=None):
+
+def capture_screenshot(url=None, storage_state=None, full_page=False):
     """Capture a screenshot of a page"""
     try:
-        return run_async(_capture_screenshot_async(url, storage_state))
+        return run_async(_capture_screenshot_async(url, storage_state, full_page))
     except Exception as e:
         return False, f"Screenshot failed: {str(e)}"
 
 async def _cleanup_browser_async():
     """Cleanup browser instances (async)"""
     try:
-        if st.session_state.browser_page:
-            await st.session_state.browser_page.close()
-        if st.session_state.browser_context:
-            await st.session_state.browser_context.close()
-        if st.session_state.browser:
-            await st.session_state.browser.close()
-        if st.session_state.playwright_instance:
-            await st.session_state.playwright_instance.stop()
+        # Close page/context/browser concurrently, each bounded to 2s: a
+        # hung page would otherwise stall the later closes behind its
+        # full timeout. Failures are logged, not swallowed silently.
+        closers = [
+            obj.close()
+            for obj in (
+                _persistent.page,
+                _persistent.context,
+                _persistent.browser,
+            )
+            if obj is not None
+        ]
+        results = await asyncio.gather(
+            *[asyncio.wait_for(c, timeout=2) for c in closers],
+            return_exceptions=True,
+        )
+        # Stop Playwright only after the closes settle; stopping tears
+        # down the transport the closes are still talking over
+        if _persistent.playwright:
+            try:
+                await asyncio.wait_for(_persistent.playwright.stop(), timeout=2)
+            except Exception as e:
+                results.append(e)
+        for r in results:
+            if isinstance(r, Exception):
+                logger.warning("Browser cleanup: %s", r)
     except Exception as e:
-        pass  # Silently fail cleanup
+        logger.warning("Browser cleanup: %s", e)
     finally:
-        # Reset state
-        st.session_state.browser_page = None
-        st.session_state.browser_context = None
-        st.session_state.browser = None
-        st.session_state.playwright_instance = None
-        st.session_state.browser_active = False
-
-        # Close event loop (if it exists and not the current one being used)
-        if st.session_state.event_loop and not st.session_state.event_loop.is_running():
-            try:
-                st.session_state.event_loop.close()
-            except Exception:
-                pass
-        st.session_state.event_loop = None
+        _persistent.reset()
+
 
 def cleanup_browser():
     """Cleanup browser instances"""
@@ -385,22 +781,37 @@ def cleanup_browser():
         run_async(_cleanup_browser_async())
     except Exception as e:
         # Force reset even if cleanup fails
-        st.session_state.browser_page = None
-        st.session_state.browser_context = None
-        st.session_state.browser = None
-        st.session_state.playwright_instance = None
-        st.session_state.browser_active = False
-
-        # Close event loop
-        if st.session_state.event_loop and not st.session_state.event_loop.is_running():
-            try:
-                st.session_state.event_loop.close()
-            except Exception:
-                pass
-        st.session_state.event_loop = None
+        _persistent.reset()
+    # Cached element lists were scanned through the session that just
+    # ended; pages can look entirely different logged out
+    clear_scan_cache()
+
+# Captured login state (cookies + localStorage) persisted across app
+# restarts. Without this, every Streamlit page reload throws away
+# st.session_state and forces another headed-browser login.
+_STORAGE_STATE_PATH = Path("~/.grabit/storage_state.json").expanduser()
+
+
+def _load_saved_storage_state():
+    """Return the storage state saved by a previous login, or None."""
+    try:
+        if _STORAGE_STATE_PATH.exists():
+            return json.loads(_STORAGE_STATE_PATH.read_text())
+    except Exception as e:
+        logger.warning("Could not load saved storage state: %s", e)
+    return None
+
+
+def _clear_saved_storage_state():
+    """Delete the on-disk storage state (logout / clear session)."""
+    try:
+        _STORAGE_STATE_PATH.unlink(missing_ok=True)
+    except Exception as e:
+        logger.warning("Could not delete saved storage state: %s", e)
+
 
 async def _capture_login_session_async(login_url, timeout=180):
-    """Open browser for manual login and keep it open (async) - NO COOKIE STORAGE!"""
+    """Open browser for manual login and keep it open (async)."""
     try:
         # Clean up any existing browser first
         await _cleanup_browser_async()
@@ -410,68 +821,77 @@ async def _capture_login_session_async(login_url, timeout=180):
 
         if headless:
             # Cloud: headless mode - manual login not supported
-            return False, "Manual login not supported in headless mode (Streamlit Cloud). Please use local development or configure automated login."
+            return False, "Manual login not supported in headless mode (Streamlit Cloud). Please use local development or configure automated login.", None
 
         # Create new playwright instance (DO NOT use context manager - we want to keep it alive!)
         p = await async_playwright().start()
         browser = await p.chromium.launch(headless=False)  # Always visible for login
         context = await browser.new_context()
+        await context.add_init_script(_SCAN_INIT_JS)
         page = await context.new_page()
 
-        await page.goto(login_url, wait_until="networkidle", timeout=30000)
+        await page.goto(login_url, wait_until="domcontentloaded", timeout=15000)
 
         # Local: visible browser - wait for user to manually login
         initial_url = page.url
-        start_time = time.time()
 
-        # Poll for URL change (indicates navigation after login)
-        while time.time() - start_time < timeout:
-            await asyncio.sleep(2)
-            try:
-                current_url = page.url
-                # If URL changed from login page, assume login successful
-                if current_url != initial_url and 'login' not in current_url.lower():
-                    break
-            except Exception:
-                # Page might be closed by user
-                return False, "Browser was closed before login completed"
-
-        # Store instances in session state (DO NOT CLOSE!)
-        st.session_state.playwright_instance = p
-        st.session_state.browser = browser
-        st.session_state.browser_context = context
-        st.session_state.browser_page = page
-        st.session_state.browser_active = True
+        # Event-driven: resolves the moment the post-login navigation
+        # commits instead of polling the URL every 2 seconds
+        try:
+            await page.wait_for_url(
+                lambda u: u != initial_url and 'login' not in u.lower(),
+                timeout=timeout * 1000,
+            )
+        except Exception:
+            # Page might be closed by user
+            if page.is_closed():
+                return False, "Browser was closed before login completed", None
+            # Otherwise the timeout elapsed without a detected login;
+            # keep the session open anyway (same as the old poll loop)
+
+        # Store instances in the module registry (DO NOT CLOSE!)
+        _persistent.playwright = p
+        _persistent.browser = browser
+        _persistent.context = context
+        _persistent.page = page
+        _persistent.active = True
+
+        # Persist the captured auth so the next app start can rehydrate
+        # a logged-in context instead of repeating the manual login. The
+        # state is returned to the caller rather than written to session
+        # state here: this coroutine runs on the worker thread, which has
+        # no ScriptRunContext.
+        state = None
+        try:
+            state = await context.storage_state()
+            _STORAGE_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            _STORAGE_STATE_PATH.write_text(json.dumps(state))
+        except Exception as e:
+            logger.warning("Could not persist storage state: %s", e)
 
-        return True, "Browser session active - no cookies stored!"
+        return True, "Browser session active - login saved for future runs", state
 
     except Exception as e:
         # Clean up on error
         await _cleanup_browser_async()
-        return False, f"Login capture failed: {str(e)}"
+        return False, f"Login capture failed: {str(e)}", None
 
 def capture_login_session(login_url, timeout=180):
     """Open browser for manual login and capture session"""
     try:
-        # Create a new persistent event loop for the browser session
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        st.session_state.event_loop = loop
-
-        # Run the async function in the persistent loop
-        result = loop.run_until_complete(_capture_login_session_async(login_url, timeout))
-
-        # Don't close the loop - keep it alive for the browser session!
-        return result
+        # The browser session lives on the global loop thread, the same
+        # loop every later automation call runs on
+        success, message, state = run_async(_capture_login_session_async(login_url, timeout))
     except Exception as e:
-        # Clean up on error
-        if st.session_state.event_loop:
-            try:
-                st.session_state.event_loop.close()
-            except:
-                pass
-            st.session_state.event_loop = None
         return False, f"Login capture failed: {str(e)}"
+    if success:
+        # Session-state write happens here on the script thread, so
+        # pooled operations run logged in from the very next rerun
+        if state is not None:
+            st.session_state.auth_storage_state = state
+        # Scans made before login saw the logged-out versions of pages
+        clear_scan_cache()
+    return success, message
 
 st.set_page_config(page_title="Web Page Launcher", layout="wide", page_icon="🔗")
 st.title("🔗 Web Page Launcher")
@@ -489,39 +909,73 @@ if 'selected_element' not in st.session_state:
 if 'selected_element_selector' not in st.session_state:
     st.session_state.selected_element_selector = None
 if 'playwright_available' not in st.session_state:
-    st.session_state.playwright_available = check_playwright_available()
+    st.session_state.playwright_available = PLAYWRIGHT_AVAILABLE
 if 'automation_status' not in st.session_state:
     st.session_state.automation_status = "Not started"
 if 'last_screenshot' not in st.session_state:
     st.session_state.last_screenshot = None
-# Browser instance state (for persistent session - no cookie storage!)
-if 'playwright_instance' not in st.session_state:
-    st.session_state.playwright_instance = None
-if 'browser' not in st.session_state:
-    st.session_state.browser = None
-if 'browser_context' not in st.session_state:
-    st.session_state.browser_context = None
-if 'browser_page' not in st.session_state:
-    st.session_state.browser_page = None
-if 'browser_active' not in st.session_state:
-    st.session_state.browser_active = False
-if 'event_loop' not in st.session_state:
-    st.session_state.event_loop = None
+if 'auth_storage_state' not in st.session_state:
+    # Rehydrate auth captured in an earlier run (O(1) file read) so a
+    # page reload doesn't cost another multi-minute manual login
+    st.session_state.auth_storage_state = _load_saved_storage_state()
+
+
+def _auth_state():
+    """Storage state for pooled operations (None when never logged in)."""
+    return st.session_state.get('auth_storage_state')
+
+
+def _auth_state_key():
+    """Short stable digest of the auth state, for use as a cache key."""
+    state = _auth_state()
+    if not state:
+        return ""
+    return hashlib.sha1(
+        json.dumps(state, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+@st.cache_data(ttl=5, max_entries=8, show_spinner=False)
+def _cached_screenshot(url, auth_key, full_page):
+    """capture_screenshot with a 5s memo, absorbing rapid re-clicks.
+
+    Users mash the capture button while waiting; each press is a full
+    page navigation. auth_key only keys the cache (the state itself is
+    read from session state), so logging in or out gets a fresh shot.
+    """
+    return capture_screenshot(url, storage_state=_auth_state(), full_page=full_page)
+
+
+# Warm the pooled browser in the background while the user reads Step 1,
+# so the first Scan/Click doesn't pay the Chromium cold start.
+if PLAYWRIGHT_AVAILABLE and 'pool_warm' not in st.session_state:
+    st.session_state.pool_warm = True
+    asyncio.run_coroutine_threadsafe(_pool._ensure_browser(), _get_loop_thread().loop)
 
 st.markdown("""
 This app provides automated web page access with element detection and clicking.
 Navigate to pages, detect clickable elements, and automate interactions!
 """)
 
-st.markdown("---")
+# Each in-flight operation holds a Chromium tab; cap how many run at
+# once so a burst of clicks queues instead of thrashing the host
+_pool.max_concurrent = st.sidebar.slider(
+    "Max concurrent browser ops",
+    min_value=1, max_value=8, value=_pool.max_concurrent,
+    help="Operations beyond this limit wait their turn instead of opening more tabs at once"
+)
+
+if st.sidebar.button("♻️ Clear scan cache", help="Force the next scan to re-walk the page instead of reusing results from the last minute"):
+    clear_scan_cache()
+    st.sidebar.success("Scan cache cleared")
 
 # ============================================================================
 # STEP 1: Login Section
 # ============================================================================
-st.header("📝 Step 1: Login to Website")
-
-# Login URL input
-st.markdown("### Login URL")
+# Static separator + header + sub-header fused into one markdown call:
+# every st.markdown/st.header is a separate element in the rerun delta,
+# and these never change
+st.markdown("---\n## 📝 Step 1: Login to Website\n### Login URL")
 login_url = st.text_input(
     "Enter website login URL",
     value="https://members.brsgolf.com/gsaayr/login",
@@ -547,7 +1001,7 @@ with col1:
             st.session_state.open_count += 1
             st.markdown(f'<a href="{login_url}" target="_blank">Click here to open login page</a>', unsafe_allow_html=True)
             st.success("✅ Login link ready - click above to open in browser!")
-            st.balloons()
+            celebrate_once()
         else:
             st.error("Please enter a login URL first")
 
@@ -578,16 +1032,27 @@ with col2:
 # Login Session Capture for Automation
 st.markdown("### 🔑 Open Browser Session (For Automation)")
 
-if st.session_state.browser_active:
-    st.success(f"✅ Browser session active! Automation will use your open browser (no cookies stored).")
+if _persistent.active:
+    st.success(f"✅ Browser session active! Automation will use your open browser.")
     col1, col2 = st.columns([1, 1])
     with col1:
         if st.button("🛑 Close Browser", use_container_width=True, type="secondary"):
             cleanup_browser()
+            # Forget the saved login too, on disk and in memory, so
+            # "close" really means logged out
+            _clear_saved_storage_state()
+            st.session_state.auth_storage_state = None
             st.success("Browser closed! Open a new session for automation.")
             st.rerun()
     with col2:
-        st.info("🔒 Secure: Browser stays open, no data stored in app")
+        st.info("🔒 Login is saved to ~/.grabit so it survives app restarts; Close Browser deletes it")
+elif st.session_state.auth_storage_state:
+    st.success("✅ Saved login found - automation will run logged in (no browser window needed).")
+    if st.button("🗑️ Forget Saved Login", type="secondary"):
+        _clear_saved_storage_state()
+        st.session_state.auth_storage_state = None
+        clear_scan_cache()
+        st.rerun()
 else:
     st.warning("⚠️ No active browser session. Automation may redirect to login page.")
 
@@ -611,7 +1076,7 @@ else:
                     success, result = capture_login_session(login_url, timeout=180)
                     if success:
                         st.success("✅ Browser session opened successfully! Browser will stay open for automation.")
-                        st.balloons()
+                        celebrate_once()
                         st.rerun()
                     else:
                         st.error(f"❌ {result}")
@@ -619,24 +1084,20 @@ else:
                 st.error("Please enter a login URL first")
 
         st.caption("""
-        💡 **How it works (Secure - No Cookie Storage!):**
+        💡 **How it works:**
         1. Click the button above
         2. A Chrome browser window will open
         3. Log in to the website normally
         4. Once logged in (URL changes from login page), the browser stays open
         5. All automation operations use this open browser
-        6. **Security:** Browser session stays in memory, no cookies saved to disk!
+        6. Your login is also saved to `~/.grabit/storage_state.json`, so
+           reloading the app (or restarting it) does not require logging in again
         """)
 
-st.markdown("---")
-
 # ============================================================================
 # STEP 2: Automated Element Detection & Clicking
 # ============================================================================
-st.header("🤖 Step 2: Scan Page & Select Element")
-
-# URL input
-st.markdown("### Target Page URL")
+st.markdown("---\n## 🤖 Step 2: Scan Page & Select Element\n### Target Page URL")
 user_url = st.text_input(
     "Enter target page URL",
     value="https://members.brsgolf.com/gsaayr/tee-sheet/1/2025/11/11",
@@ -650,18 +1111,28 @@ if not st.session_state.playwright_available:
 
 # Scan and Screenshot buttons
 st.markdown("### Page Analysis")
+
+# Fast mode applies to all pooled operations (scan, click, screenshot);
+# flipping it relaunches the headless browser on the next action
+_pool.fast_mode = st.checkbox(
+    "⚡ Fast mode (block images)",
+    value=_pool.fast_mode,
+    help="Skip images, fonts, media and CSS during scans and auto-clicks. "
+         "Pages load much faster, but screenshots lose images and styling.",
+)
+
 col1, col2 = st.columns([1, 1])
 
 with col1:
     if st.button("🔍 Scan Page for Elements", use_container_width=True, type="primary", disabled=not st.session_state.playwright_available):
         if user_url:
             with st.spinner("🔄 Scanning page for clickable elements..."):
-                success, result = scan_clickable_elements(user_url)
+                success, result = scan_clickable_elements(user_url, storage_state=_auth_state())
                 if success:
                     st.session_state.detected_elements = result
                     st.session_state.automation_status = f"Found {len(result)} elements"
                     st.success(f"✅ Found {len(result)} clickable elements!")
-                    st.balloons()
+                    celebrate_once()
                 else:
                     st.error(f"❌ {result}")
                     st.session_state.automation_status = f"Scan failed: {result}"
@@ -669,10 +1140,15 @@ with col1:
             st.error("Please enter a URL first")
 
 with col2:
+    full_page_shot = st.checkbox(
+        "Full page screenshot",
+        value=False,
+        help="Capture the entire scroll height instead of just the viewport (larger and slower)"
+    )
     if st.button("📸 Capture Screenshot", use_container_width=True, disabled=not st.session_state.playwright_available):
         if user_url:
             with st.spinner("📸 Capturing screenshot..."):
-                success, result = capture_screenshot(user_url)
+                success, result = _cached_screenshot(user_url, _auth_state_key(), full_page_shot)
                 if success:
                     st.session_state.last_screenshot = result
                     st.success("✅ Screenshot captured!")
@@ -682,34 +1158,57 @@ with col2:
             st.error("Please enter a URL first")
 
 # Display screenshot if available
-if st.session_state.last_screenshot:
+@st.fragment
+def screenshot_panel():
+    """Render the latest screenshot.
+
+    As a fragment, its widgets diff against only this subtree — reruns
+    triggered elsewhere (countdown ticks, element selection) don't
+    reship the image bytes to the frontend.
+    """
+    if not st.session_state.last_screenshot:
+        return
     with st.expander("📸 View Latest Screenshot"):
         st.image(st.session_state.last_screenshot, caption="Page Screenshot", use_container_width=True)
 
+
+screenshot_panel()
+
 # Element selection UI
 if st.session_state.detected_elements:
-    st.markdown("---")
-    st.markdown("### 🎯 Select Element to Auto-Click")
-
-    # Create a formatted list for selection
-    element_options = {}
-    for elem in st.session_state.detected_elements:
-        status_icon = "✅" if elem['enabled'] else "⏸️"
-        label = f"{status_icon} [{elem['type']}] {elem['text'][:60]}"
-        element_options[label] = elem
-
-    # Find index by comparing selectors (stable across reruns)
-    selected_index = 0
-    if st.session_state.selected_element_selector:
-        for i, label in enumerate(list(element_options.keys()), start=1):
-            if element_options[label]['selector'] == st.session_state.selected_element_selector:
-                selected_index = i
-                break
+    st.markdown("---\n### 🎯 Select Element to Auto-Click")
+
+    # Create a formatted list for selection; cached on the scanned list
+    # so the labels are formatted once per scan, not once per rerun
+    @st.cache_data(show_spinner=False)
+    def build_element_options(elements_json):
+        elements = json.loads(elements_json)
+        options = {}
+        for elem in elements:
+            status_icon = "✅" if elem['enabled'] else "⏸️"
+            options[f"{status_icon} [{elem['type']}] {elem['text'][:60]}"] = elem
+        return options
+
+    element_options = build_element_options(json.dumps(st.session_state.detected_elements))
+
+    options = ["None"] + list(element_options.keys())
+
+    # Remember the picked index once, in the change callback, instead of
+    # re-scanning the options list to find it on every rerun
+    def _remember_element_choice():
+        st.session_state.selected_element_idx = options.index(st.session_state.element_choice)
+
+    selected_index = st.session_state.get('selected_element_idx', 0)
+    if selected_index >= len(options):
+        # A re-scan shrank the list; fall back to "None"
+        selected_index = 0
 
     selected_label = st.selectbox(
         "Choose which element to automatically click during auto-refresh",
-        options=["None"] + list(element_options.keys()),
-        index=selected_index
+        options=options,
+        index=selected_index,
+        key="element_choice",
+        on_change=_remember_element_choice,
     )
 
     if selected_label != "None":
@@ -738,17 +1237,17 @@ if st.session_state.detected_elements:
         with col1:
             if st.button("🧪 Test Click Now", use_container_width=True):
                 with st.spinner(f"🖱️ Clicking element: {elem['text'][:40]}..."):
-                    success, message = click_element_when_ready(
+                    success, message, screenshot = click_element_when_ready(
                         user_url,
                         elem['selector'],
                         wait_enabled=False,
-                        timeout=5
+                        timeout=5,
+                        storage_state=_auth_state(),
+                        capture_after=True
                     )
                     if success:
                         st.success(f"✅ {message}")
-                        # Capture screenshot after click
-                        success_ss, screenshot = capture_screenshot(user_url)
-                        if success_ss:
+                        if screenshot:
                             st.session_state.last_screenshot = screenshot
                             st.image(screenshot, caption="After Click", use_container_width=True)
                     else:
@@ -760,17 +1259,38 @@ if st.session_state.detected_elements:
         st.session_state.selected_element_selector = None
         st.info("👆 Select an element from the dropdown to enable automation")
 
+    # Batch testing: each selected candidate gets its own tab and the
+    # clicks run concurrently, so trying 5 elements takes about as long
+    # as trying the slowest one
+    with st.expander("🧪 Test several elements at once"):
+        multi_labels = st.multiselect(
+            "Candidates to test-click concurrently",
+            options=list(element_options.keys()),
+            help="Each element is clicked in its own browser tab, all at the same time"
+        )
+        if st.button("🧪 Test Click All Selected", disabled=not multi_labels):
+            with st.spinner(f"🖱️ Clicking {len(multi_labels)} elements concurrently..."):
+                selectors = [element_options[label]['selector'] for label in multi_labels]
+                results = click_elements_when_ready(
+                    user_url, selectors, wait_enabled=False, timeout=5,
+                    storage_state=_auth_state()
+                )
+                for label, (ok, message) in zip(multi_labels, results):
+                    text = element_options[label]['text'][:40]
+                    if ok:
+                        st.success(f"✅ {text}: {message}")
+                    else:
+                        st.error(f"❌ {text}: {message}")
+
 # Fallback: Simple URL opening for non-MCP environments
 elif not st.session_state.playwright_available and user_url:
-    st.markdown("---")
-    st.markdown("### Simple Mode (No Automation)")
+    st.markdown("---\n### Simple Mode (No Automation)")
     if st.button("🌐 Open URL in Browser", use_container_width=True, type="primary"):
         st.markdown(f'<a href="{user_url}" target="_blank">Click here to open page</a>', unsafe_allow_html=True)
         st.success("✅ Link ready - click above to open!")
 
 # Auto-refresh helper
-st.markdown("---")
-st.markdown("### 🔄 Auto-Refresh Helper")
+st.markdown("---\n### 🔄 Auto-Refresh Helper")
 
 col1, col2, col3 = st.columns([2, 1, 1])
 
@@ -798,6 +1318,14 @@ with col3:
         help="How long to wait for element to become enabled before timeout"
     )
 
+# Off by default: most ticks don't need visual confirmation, and
+# skipping the capture makes each one cheaper
+capture_ss_each_tick = st.checkbox(
+    "Capture screenshot after each auto-action",
+    value=False,
+    help="Take a confirmation screenshot on every successful auto-click or auto-navigate"
+)
+
 if auto_refresh_enabled:
     # Show status based on whether automation is configured
     if st.session_state.selected_element and st.session_state.playwright_available:
@@ -815,116 +1343,122 @@ if auto_refresh_enabled:
     current_time = time.time()
 
     # Check if it's time to refresh
-    if current_time >= st.session_state.next_refresh_time:
+    # Guard against overlapping ticks: a click slower than the interval
+    # must not let the next rerun start a second Playwright job against
+    # the same browser. The deadline is set after the action completes,
+    # so intervals measure end-to-end and never queue up work.
+    if current_time >= st.session_state.next_refresh_time and not st.session_state.get('click_in_flight', False):
         if user_url:
-            # AUTOMATION MODE: Use browser automation if Playwright is available
-            if st.session_state.playwright_available:
-                print(f"[DEBUG] Auto-refresh: Using AUTOMATION mode - will use persistent browser if available")
-                print(f"[DEBUG] Auto-refresh: browser_active={st.session_state.browser_active}, selected_element={st.session_state.selected_element['text'][:40] if st.session_state.selected_element else None}")
-
-                # Sub-mode 1: Element selected - Navigate + Click
-                if st.session_state.selected_element:
-                    with st.spinner(f"🤖 Automating click on: {st.session_state.selected_element['text'][:40]}..."):
-                        # Navigate to page and click element (with wait if enabled)
-                        click_success, click_message = click_element_when_ready(
-                            user_url,
-                            st.session_state.selected_element['selector'],
-                            wait_enabled=True,
-                            timeout=wait_timeout
-                        )
-
-                        if click_success:
-                            st.session_state.automation_status = f"✅ Auto-clicked successfully at {time.strftime('%H:%M:%S')}"
-                            st.session_state.open_count += 1
-                            st.session_state.last_opened = f"Auto-click #{st.session_state.open_count}"
-
-                            # Capture screenshot after successful click
-                            ss_success, screenshot = capture_screenshot(user_url)
-                            if ss_success:
-                                st.session_state.last_screenshot = screenshot
-
-                            st.toast(f"🤖 {click_message}", icon="✅")
-                            st.success(f"✅ {click_message}")
-
-                            # Show screenshot if captured
-                            if ss_success:
-                                st.image(screenshot, caption=f"Auto-clicked at {time.strftime('%H:%M:%S')}", use_container_width=True)
-                        else:
-                            st.session_state.automation_status = f"❌ Click failed: {click_message}"
-                            st.error(f"❌ {click_message}")
-                            st.warning("💡 Element may not be available yet. Continuing to monitor...")
-
-                # Sub-mode 2: No element selected - Navigate only (NEW!)
-                else:
-                    with st.spinner(f"🌐 Navigating to page..."):
-                        # Navigate to page without clicking
-                        nav_success, nav_message = navigate_with_persistent_browser(user_url)
-
-                        if nav_success:
-                            st.session_state.automation_status = f"✅ Navigated successfully at {time.strftime('%H:%M:%S')}"
-                            st.session_state.open_count += 1
-                            st.session_state.last_opened = f"Auto-navigate #{st.session_state.open_count}"
-
-                            # Capture screenshot after successful navigation
-                            ss_success, screenshot = capture_screenshot(user_url)
-                            if ss_success:
-                                st.session_state.last_screenshot = screenshot
-
-                            st.toast(f"🌐 {nav_message}", icon="✅")
-                            st.success(f"✅ {nav_message}")
-
-                            # Show screenshot if captured
-                            if ss_success:
-                                st.image(screenshot, caption=f"Auto-navigated at {time.strftime('%H:%M:%S')}", use_container_width=True)
-                        else:
-                            st.session_state.automation_status = f"❌ Navigation failed: {nav_message}"
-                            st.error(f"❌ {nav_message}")
-                            st.warning("💡 Page may not be available. Continuing to monitor...")
-
-            # FALLBACK MODE: Simple URL opening when Playwright not available
-            else:
-                print(f"[DEBUG] Auto-refresh: Using FALLBACK mode (selected_element={st.session_state.selected_element is not None}, playwright={st.session_state.playwright_available})")
-                print(f"[DEBUG] Auto-refresh: This will open a NEW TAB in system browser (not using persistent browser)")
-                if is_streamlit_cloud():
-                    # Streamlit Cloud: Use JavaScript anchor click
-                    auto_click_html = f"""
-                    <script>
-                    (function() {{
-                        const link = document.createElement('a');
-                        link.href = '{user_url}';
-                        link.target = '_blank';
-                        link.rel = 'noopener noreferrer';
-                        document.body.appendChild(link);
-                        link.click();
-                        document.body.removeChild(link);
-                    }})();
-                    </script>
-                    """
-                    components.html(auto_click_html, height=0)
-                    st.warning("🚨 **If no tab opened (popup blocked), click here:**")
-                    st.markdown(
-                        f'<a href="{user_url}" target="_blank" style="display:inline-block;padding:12px 24px;background-color:#ff4b4b;color:white;text-decoration:none;border-radius:5px;font-weight:bold;font-size:18px;">📱 CLICK TO OPEN PAGE</a>',
-                        unsafe_allow_html=True
-                    )
+            st.session_state.click_in_flight = True
+            try:
+                # AUTOMATION MODE: Use browser automation if Playwright is available
+                if st.session_state.playwright_available:
+                    logger.debug("Auto-refresh: automation mode - will use persistent browser if available")
+                    logger.debug("Auto-refresh: browser_active=%s, selected_element=%s", _persistent.active, st.session_state.selected_element['text'][:40] if st.session_state.selected_element else None)
+
+                    # Sub-mode 1: Element selected - Navigate + Click
+                    if st.session_state.selected_element:
+                        with st.spinner(f"🤖 Automating click on: {st.session_state.selected_element['text'][:40]}..."):
+                            # Navigate to page and click element (with wait if
+                            # enabled); when enabled, the confirmation
+                            # screenshot comes back from the same page visit
+                            result = click_element_when_ready(
+                                user_url,
+                                st.session_state.selected_element['selector'],
+                                wait_enabled=True,
+                                timeout=wait_timeout,
+                                storage_state=_auth_state(),
+                                capture_after=capture_ss_each_tick
+                            )
+                            if capture_ss_each_tick:
+                                click_success, click_message, screenshot = result
+                            else:
+                                click_success, click_message = result
+                                screenshot = None
+
+                            if click_success:
+                                st.session_state.automation_status = f"✅ Auto-clicked successfully at {time.strftime('%H:%M:%S')}"
+                                st.session_state.open_count += 1
+                                st.session_state.last_opened = f"Auto-click #{st.session_state.open_count}"
+
+                                if screenshot:
+                                    st.session_state.last_screenshot = screenshot
+
+                                st.toast(f"🤖 {click_message}", icon="✅")
+                                st.success(f"✅ {click_message}")
+
+                                # Show screenshot if captured
+                                if screenshot:
+                                    st.image(screenshot, caption=f"Auto-clicked at {time.strftime('%H:%M:%S')}", use_container_width=True)
+                            else:
+                                st.session_state.automation_status = f"❌ Click failed: {click_message}"
+                                st.error(f"❌ {click_message}")
+                                st.warning("💡 Element may not be available yet. Continuing to monitor...")
+
+                    # Sub-mode 2: No element selected - Navigate only (NEW!)
+                    else:
+                        with st.spinner(f"🌐 Navigating to page..."):
+                            # Navigate to page without clicking
+                            nav_success, nav_message = navigate_with_persistent_browser(user_url, storage_state=_auth_state())
+
+                            if nav_success:
+                                st.session_state.automation_status = f"✅ Navigated successfully at {time.strftime('%H:%M:%S')}"
+                                st.session_state.open_count += 1
+                                st.session_state.last_opened = f"Auto-navigate #{st.session_state.open_count}"
+
+                                # Capture screenshot after successful navigation
+                                ss_success = False
+                                if capture_ss_each_tick:
+                                    ss_success, screenshot = capture_screenshot(user_url, storage_state=_auth_state())
+                                    if ss_success:
+                                        st.session_state.last_screenshot = screenshot
+
+                                st.toast(f"🌐 {nav_message}", icon="✅")
+                                st.success(f"✅ {nav_message}")
+
+                                # Show screenshot if captured
+                                if ss_success:
+                                    st.image(screenshot, caption=f"Auto-navigated at {time.strftime('%H:%M:%S')}", use_container_width=True)
+                            else:
+                                st.session_state.automation_status = f"❌ Navigation failed: {nav_message}"
+                                st.error(f"❌ {nav_message}")
+                                st.warning("💡 Page may not be available. Continuing to monitor...")
+
+                # FALLBACK MODE: Simple URL opening when Playwright not available
                 else:
-                    # Local development: Use native webbrowser.open
-                    webbrowser.open(user_url, new=2)
-                    st.toast("🔄 Opened new tab", icon="✅")
+                    logger.debug("Auto-refresh: fallback mode (selected_element=%s, playwright=%s)", st.session_state.selected_element is not None, st.session_state.playwright_available)
+                    logger.debug("Auto-refresh: opening a new tab in the system browser (not using persistent browser)")
+                    if is_streamlit_cloud():
+                        # Native anchor: the old injected-script click was
+                        # popup-blocked more often than not, forcing a second
+                        # manual click anyway, and re-installed a component
+                        # iframe on every tick
+                        st.link_button("📱 Open target page in new tab", user_url, type="primary")
+                    else:
+                        # Local development: Use native webbrowser.open
+                        webbrowser.open(user_url, new=2)
+                        st.toast("🔄 Opened new tab", icon="✅")
 
-                st.session_state.last_opened = f"Simple open #{st.session_state.open_count}"
-                st.session_state.open_count += 1
+                    st.session_state.last_opened = f"Simple open #{st.session_state.open_count}"
+                    st.session_state.open_count += 1
 
-            # Update timer for next refresh
-            st.session_state.next_refresh_time = time.time() + refresh_interval
+                # Update timer for next refresh
+                st.session_state.next_refresh_time = time.time() + refresh_interval
+            finally:
+                st.session_state.click_in_flight = False
+
+    # Per-second countdown updates rerun only this fragment — the full
+    # script (module body, widget tree, Playwright checks) reruns only
+    # when the deadline arrives and the click logic above must execute
+    @st.fragment(run_every=1.0)
+    def countdown_panel():
+        remaining = int(st.session_state.next_refresh_time - time.time())
+        if remaining > 0:
+            st.info(f"⏳ Next action in: **{remaining}** seconds | Status: {st.session_state.automation_status}")
+        else:
+            st.rerun(scope="app")
 
-    # Show countdown
-    time_remaining = int(st.session_state.next_refresh_time - current_time)
-    if time_remaining > 0:
-        st.info(f"⏳ Next action in: **{time_remaining}** seconds | Status: {st.session_state.automation_status}")
-        time.sleep(1)
-        st.rerun()
-    else:
-        st.rerun()
+    countdown_panel()
 
 else:
     # Reset timer when disabled
@@ -934,38 +1468,27 @@ else:
 # ============================================================================
 # Session Statistics
 # ============================================================================
-st.markdown("---")
-st.subheader("📊 Session Statistics")
-
-col1, col2, col3, col4, col5 = st.columns(5)
-
-with col1:
-    st.metric("Total Actions", st.session_state.open_count)
-
-with col2:
-    if st.session_state.last_opened:
-        st.metric("Last Action", st.session_state.last_opened)
-    else:
-        st.metric("Last Action", "None yet")
-
-with col3:
-    automation_status = "🤖 Enabled" if st.session_state.selected_element else "📱 Manual"
-    st.metric("Mode", automation_status)
-
-with col4:
-    browser_status = "✅ Active" if st.session_state.browser_active else "🔓 Closed"
-    st.metric("Browser Status", browser_status)
-
-with col5:
-    playwright_status = "✅ Available" if st.session_state.playwright_available else "⚠️ Unavailable"
-    st.metric("Playwright", playwright_status)
+st.markdown("---\n### 📊 Session Statistics")
+
+# One dataframe render instead of five st.metric widgets — each metric is
+# its own element in the rerun protocol, and this block redraws every pass.
+stats = pd.DataFrame([{
+    "Total Actions": st.session_state.open_count,
+    "Last Action": st.session_state.last_opened or "None yet",
+    "Mode": "🤖 Enabled" if st.session_state.selected_element else "📱 Manual",
+    "Browser Status": "✅ Active" if _persistent.active else "🔓 Closed",
+    "Playwright": "✅ Available" if st.session_state.playwright_available else "⚠️ Unavailable",
+}])
+st.dataframe(stats, hide_index=True, use_container_width=True)
 
 # ============================================================================
 # User Guidance
 # ============================================================================
 st.markdown("---")
-st.info("""
-### 📖 How to Use This App
+# Collapsed by default: the full guide is ~2KB of markdown that nobody
+# needs re-rendered on every pass through the script
+with st.expander("📖 How to Use This App", expanded=False):
+    st.markdown("""
 
 **Automated Workflow (Recommended):**
 1. **Step 1:** Click **"🔐 Open Browser & Login"** → Log in to the website in the Playwright browser window
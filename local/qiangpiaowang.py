@@ -1,173 +1,408 @@
 import streamlit as st
-import streamlit.components.v1 as components
-import webbrowser
+import pandas as pd
+from streamlit_autorefresh import st_autorefresh
+import sys
 import time
-import os
-import platform
 import json
+import zlib
+from io import BytesIO
+from pathlib import Path
 
-# Environment detection
-def is_streamlit_cloud():
-    """Detect if running on Streamlit Cloud vs local development"""
-    # Streamlit Cloud runs on Linux with empty processor string
-    # Also check for 'appuser' which is the default Streamlit Cloud user
-    return platform.processor() == '' or os.getenv('USER') == 'appuser'
+# Pillow ships with Streamlit, so this adds no dependency
+from PIL import Image
+
+# Shared auto-refresh helpers live at the repo root; streamlit run only
+# puts this script's own directory on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from autorefresh import celebrate_once, open_url_new_tab, render_countdown
 
 # ============================================================================
 # MCP Puppeteer Integration
 # ============================================================================
 
+# Resolve the MCP tools once at import. The old per-call
+# "from tools import ..." re-ran the import machinery (meta_path finders,
+# sys.modules lookups) on every navigate/scan/click/screenshot - and the
+# availability probe paid the full failed-import walk each time it was
+# asked.
+try:
+    from tools import (
+        mcp__puppeteer__puppeteer_navigate,
+        mcp__puppeteer__puppeteer_evaluate,
+        mcp__puppeteer__puppeteer_click,
+        mcp__puppeteer__puppeteer_screenshot,
+    )
+    MCP_AVAILABLE = True
+except (ImportError, ModuleNotFoundError):
+    MCP_AVAILABLE = False
+
+# Everything the scan treats as clickable, shared by the scan script below
+_CLICKABLE_SELECTOR = 'button, a, input[type="submit"], input[type="button"], [role="button"]'
+
+# Scan script hoisted to module scope: built once per process instead of
+# re-constructed per call, and the constant string lets the browser's
+# script cache kick in across evaluations. Each candidate without an id
+# is tagged with a unique data-grabit-id attribute so the selector is an
+# O(1) attribute lookup — no per-element sibling walk and stable even if
+# the DOM shifts positions between scan and click.
+# The load wait is fused into the same script: waiting and scanning in
+# one evaluate saves an MCP round-trip (~50-200ms over stdio) per scan.
+_CLICKABLES_JS = """
+(async () => {
+    // Proceed as soon as the page's load event has fired (immediately
+    // if it already has), plus a settling beat for post-load scripts
+    if (document.readyState !== 'complete') {
+        await new Promise(r => window.addEventListener('load', r, {once: true}));
+    }
+    await new Promise(r => setTimeout(r, 100));
+    // Single pass over the NodeList: the old filter().map() chain built
+    // two intermediate arrays of every candidate before dropping the
+    // invisible ones
+    const matches = document.querySelectorAll(__CLICKABLE_SELECTOR__);
+    // Column layout: field names ship once in 'k' instead of being
+    // repeated in every element object; rows in 'r' are plain tuples.
+    // Python rebuilds dicts on arrival (see scan_clickable_elements).
+    // No 'visible' column: only elements that pass the visibility
+    // filter are returned, so the flag was always true
+    const out = {k: ['index', 'text', 'selector', 'enabled', 'type', 'id', 'class'], r: []};
+    for (const el of matches) {
+        if (el.offsetParent === null) continue;  // visible only
+        const i = out.r.length;
+        const text = (el.textContent || el.value || '').trim().substring(0, 80) || `Element ${i+1}`;
+        const id = el.id;
+        const className = el.className;
+
+        // Generate selector (prefer ID, else tag with data-grabit-id)
+        let selector;
+        if (id) {
+            selector = `#${id}`;
+        } else {
+            el.setAttribute('data-grabit-id', i);
+            selector = `[data-grabit-id="${i}"]`;
+        }
+
+        out.r.push([
+            i,
+            text,
+            selector,
+            !el.disabled && !el.hasAttribute('disabled'),
+            el.tagName,
+            id || '',
+            (typeof className === 'string' ? className : '')
+        ]);
+    }
+    return out;
+})()
+"""
+
+# json.dumps gives a valid JS string literal, quotes and all
+_CLICKABLES_JS = _CLICKABLES_JS.replace("__CLICKABLE_SELECTOR__", json.dumps(_CLICKABLE_SELECTOR))
+
+# Readiness wait and click fused into one script, hoisted like
+# _CLICKABLES_JS so the source is built once and the browser's script
+# cache sees a constant function body; only the two arguments vary per
+# call. Polling starts at 50ms and backs off exponentially to 500ms - an
+# element that is already enabled is clicked on the first check instead
+# of after the old fixed half-second sleep. Clicking inside the same
+# evaluate saves the separate puppeteer_click round-trip (~50-200ms over
+# stdio) that used to follow the wait. timeout=0 degenerates to a single
+# check-and-click with no polling.
+_CLICK_READY_JS = """
+(async (selector, timeout) => {
+    const start = Date.now();
+    let delay = 50;
+    while (true) {
+        const el = document.querySelector(selector);
+        if (el && !el.disabled && !el.hasAttribute('disabled') && el.offsetParent !== null) {
+            el.click();
+            return true;
+        }
+        if (Date.now() - start >= timeout) {
+            throw new Error('Element not ready after ' + (timeout / 1000) + ' seconds');
+        }
+        await new Promise(r => setTimeout(r, delay));
+        delay = Math.min(delay * 2, 500);
+    }
+})
+"""
+
+# Re-stamps the synthetic data-grabit-id tags after a navigation. The
+# tags only exist on the DOM the scan ran against - a reload wipes them,
+# leaving every id-less stored selector pointing at nothing. Same
+# selector, visibility filter and counting order as _CLICKABLES_JS, so
+# an unchanged page reproduces exactly the index each element was
+# scanned with; elements with an id never needed a tag.
+_RETAG_JS = """
+(async () => {
+    if (document.readyState !== 'complete') {
+        await new Promise(r => window.addEventListener('load', r, {once: true}));
+    }
+    await new Promise(r => setTimeout(r, 100));
+    const matches = document.querySelectorAll(__CLICKABLE_SELECTOR__);
+    let i = 0;
+    for (const el of matches) {
+        if (el.offsetParent === null) continue;
+        if (!el.id) el.setAttribute('data-grabit-id', i);
+        i++;
+    }
+    return i;
+})()
+"""
+
+_RETAG_JS = _RETAG_JS.replace("__CLICKABLE_SELECTOR__", json.dumps(_CLICKABLE_SELECTOR))
+
+
 def check_mcp_available():
     """Check if MCP Puppeteer tools are available"""
+    return MCP_AVAILABLE
+
+def navigate_to_page(url, force=False):
+    """Navigate to a URL using MCP Puppeteer.
+
+    The MCP server keeps one long-lived browser across calls, so the
+    per-call cost is the navigation itself. When the page is already on
+    `url` the call is skipped unless force is set - callers that need
+    fresh server state (the auto-refresh monitor watching for a button
+    to enable) pass force=True to get a real reload.
+    """
+    if not MCP_AVAILABLE:
+        return False, "MCP Puppeteer not available"
+    if not force and st.session_state.get('_last_nav_url') == url:
+        return True, "Already on page"
     try:
-        # Try importing the MCP tools
-        from tools import (
-            mcp__puppeteer__puppeteer_navigate,
-            mcp__puppeteer__puppeteer_evaluate,
-            mcp__puppeteer__puppeteer_click,
-            mcp__puppeteer__puppeteer_screenshot
-        )
-        return True
-    except (ImportError, ModuleNotFoundError):
-        return False
-
-def navigate_to_page(url):
-    """Navigate to a URL using MCP Puppeteer"""
-    try:
-        from tools import mcp__puppeteer__puppeteer_navigate
         mcp__puppeteer__puppeteer_navigate(url=url)
+        st.session_state._last_nav_url = url
         return True, "Navigation successful"
     except Exception as e:
+        # Unknown page state after a failed navigation; don't skip next time
+        st.session_state._last_nav_url = None
         return False, f"Navigation failed: {str(e)}"
 
+def _retag_elements():
+    """Re-stamp the scan's synthetic selectors on the current page.
+
+    Called after a forced navigation and before a click whose stored
+    selector relies on data-grabit-id; without it the selector matches
+    nothing on the fresh DOM and every auto-click cycle fails.
+    """
+    if not MCP_AVAILABLE:
+        return
+    try:
+        mcp__puppeteer__puppeteer_evaluate(script=_RETAG_JS)
+    except Exception:
+        # The click's own readiness wait reports the failure properly
+        pass
+
 def scan_clickable_elements(url):
     """Scan page for all clickable elements"""
+    if not MCP_AVAILABLE:
+        return False, "MCP Puppeteer not available"
     try:
-        from tools import (
-            mcp__puppeteer__puppeteer_navigate,
-            mcp__puppeteer__puppeteer_evaluate
-        )
-
-        # Navigate to the page
+        # Navigate, then wait-and-scan in one evaluate; the scan script
+        # awaits the load event itself before walking the DOM
         mcp__puppeteer__puppeteer_navigate(url=url)
-        time.sleep(2)  # Wait for page to load
-
-        # JavaScript to find all clickable elements
-        js_code = """
-        (() => {
-            return Array.from(document.querySelectorAll('button, a, input[type="submit"], input[type="button"], [role="button"]'))
-                .filter(el => el.offsetParent !== null)  // visible only
-                .map((el, i) => {
-                    const text = (el.textContent || el.value || '').trim().substring(0, 80) || `Element ${i+1}`;
-                    const id = el.id;
-                    const className = el.className;
-
-                    // Generate selector (prefer ID, then class, then nth-of-type)
-                    let selector;
-                    if (id) {
-                        selector = `#${id}`;
-                    } else if (className && typeof className === 'string' && className.trim()) {
-                        const firstClass = className.trim().split(' ')[0];
-                        selector = `.${firstClass}`;
-                    } else {
-                        const tagName = el.tagName.toLowerCase();
-                        const siblings = Array.from(el.parentNode.querySelectorAll(tagName));
-                        const index = siblings.indexOf(el) + 1;
-                        selector = `${tagName}:nth-of-type(${index})`;
-                    }
-
-                    return {
-                        index: i,
-                        text: text,
-                        selector: selector,
-                        enabled: !el.disabled && !el.hasAttribute('disabled'),
-                        visible: true,
-                        type: el.tagName,
-                        id: id || '',
-                        class: (typeof className === 'string' ? className : '')
-                    };
-                });
-        })()
-        """
-
-        result = mcp__puppeteer__puppeteer_evaluate(script=js_code)
-        elements = json.loads(result) if isinstance(result, str) else result
-        return True, elements
+        st.session_state._last_nav_url = url
+        result = mcp__puppeteer__puppeteer_evaluate(script=_CLICKABLES_JS)
+        # The driver hands back Python objects when it deserializes the
+        # wire JSON itself; only parse when we actually got raw
+        # JSON text/bytes, so the payload is never decoded twice
+        if isinstance(result, (str, bytes, bytearray)):
+            result = json.loads(result)
+        # Expand the column layout back into per-element dicts for the UI
+        keys = result['k']
+        return True, [dict(zip(keys, row)) for row in result['r']]
 
     except Exception as e:
         return False, f"Scan failed: {str(e)}"
 
-def click_element_when_ready(selector, wait_enabled=True, timeout=30):
-    """Click an element, optionally waiting for it to be enabled"""
+def _merge_elements(old, new):
+    """Fold a fresh scan into the existing element list.
+
+    When a rescan returns the same elements, keep the old list object
+    instead of swapping in an equal-but-new one: downstream state keyed
+    on the list (the selectbox diff, the cached label maps) then sees an
+    unchanged value rather than a spurious replacement. Only a scan that
+    actually changed something mutates the list - in place, so the
+    reference in session state stays stable either way.
+    """
+    if old is None or not isinstance(old, list):
+        return new
+    if old == new:
+        return old
+    old[:] = new
+    return old
+
+
+def click_and_snapshot(selector, wait_enabled=True, timeout=30):
+    """Click an element and capture the after-click screenshot.
+
+    The wait and the click run in one evaluate (see _CLICK_READY_JS), so
+    a click costs two MCP round-trips instead of three. The screenshot
+    cannot join the same evaluate - page.screenshot is a Puppeteer API,
+    not callable from in-page script - so it stays a second RPC.
+
+    Returns:
+        (ok, message, screenshot) - screenshot is the thumbnailed image
+        when the click and capture both succeeded, else None
+    """
+    if not MCP_AVAILABLE:
+        return False, "MCP Puppeteer not available", None
     try:
-        from tools import (
-            mcp__puppeteer__puppeteer_evaluate,
-            mcp__puppeteer__puppeteer_click
-        )
+        # json.dumps yields a valid JS string literal, so selectors
+        # containing quotes can't break out of the script
+        timeout_ms = int(timeout * 1000) if wait_enabled else 0
+        click_js = f"({_CLICK_READY_JS})({json.dumps(selector)}, {timeout_ms})"
 
-        if wait_enabled:
-            # Wait for element to be enabled (poll every 0.5s for up to timeout seconds)
-            wait_js = f"""
-            (async () => {{
-                const selector = '{selector}';
-                const timeout = {timeout * 1000};  // Convert to milliseconds
-                const start = Date.now();
-
-                while (Date.now() - start < timeout) {{
-                    const el = document.querySelector(selector);
-                    if (el && !el.disabled && !el.hasAttribute('disabled') && el.offsetParent !== null) {{
-                        return true;
-                    }}
-                    await new Promise(r => setTimeout(r, 500));
-                }}
-                throw new Error('Element not ready after ' + {timeout} + ' seconds');
-            }})()
-            """
-
-            try:
-                mcp__puppeteer__puppeteer_evaluate(script=wait_js)
-            except Exception as e:
-                return False, f"Element not ready: {str(e)}"
-
-        # Click the element
-        mcp__puppeteer__puppeteer_click(selector=selector)
-        return True, "Element clicked successfully"
+        try:
+            mcp__puppeteer__puppeteer_evaluate(script=click_js)
+        except Exception as e:
+            return False, f"Element not ready: {str(e)}", None
+
+        ok, screenshot = capture_screenshot()
+        return True, "Element clicked successfully", screenshot if ok else None
 
     except Exception as e:
-        return False, f"Click failed: {str(e)}"
+        return False, f"Click failed: {str(e)}", None
+
+def _element_signature(selector):
+    """CRC of the target element's subtree, or None when unavailable.
+
+    One small evaluate buys a change detector: if the freshly loaded
+    subtree is byte-identical to what the last failed attempt saw, the
+    full readiness wait would just burn its timeout again, so the
+    caller can skip straight to the next cycle.
+    """
+    if not MCP_AVAILABLE:
+        return None
+    try:
+        raw = mcp__puppeteer__puppeteer_evaluate(
+            script=(
+                "(sel => {const el = document.querySelector(sel);"
+                f" return el ? el.outerHTML : '';}})({json.dumps(selector)})"
+            )
+        )
+        return zlib.crc32(str(raw).encode())
+    except Exception:
+        return None
+
+
+def _shrink_screenshot(image_bytes):
+    """Thumbnail a screenshot before it enters session state.
+
+    Raw Puppeteer PNGs run 500KB-3MB, and whatever sits in session
+    state is repickled and reshipped to the browser on every rerun.
+    Downscaling to 800px and re-encoding as WebP q70 gets that to
+    20-80KB. Non-bytes payloads (drivers that return a base64 string
+    or a path) pass through untouched.
+    """
+    if not isinstance(image_bytes, (bytes, bytearray)):
+        return image_bytes
+    try:
+        img = Image.open(BytesIO(image_bytes))
+        img.thumbnail((800, 800))
+        out = BytesIO()
+        img.save(out, "WEBP", quality=70, method=4)
+        return out.getvalue()
+    except Exception:
+        return image_bytes
+
 
 def capture_screenshot():
-    """Capture a screenshot of the current page"""
+    """Capture a screenshot of the current page, thumbnailed for the UI"""
+    if not MCP_AVAILABLE:
+        return False, "MCP Puppeteer not available"
     try:
-        from tools import mcp__puppeteer__puppeteer_screenshot
         screenshot = mcp__puppeteer__puppeteer_screenshot(
             name="automation_screenshot",
             width=1280,
             height=720
         )
-        return True, screenshot
+        return True, _shrink_screenshot(screenshot)
     except Exception as e:
         return False, f"Screenshot failed: {str(e)}"
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _scan_or_raise(url):
+    """Successful scan_clickable_elements results, memoized per URL.
+
+    Failures are raised rather than returned so st.cache_data never
+    stores them - a transient network blip must not pin an error on the
+    Scan button for five minutes. Same successes-only policy as the
+    Playwright-side scan cache.
+    """
+    success, result = scan_clickable_elements(url)
+    if not success:
+        raise RuntimeError(result)
+    return result
+
+
+def _cached_scan(url):
+    """scan_clickable_elements memoized per URL for five minutes.
+
+    Repeat scans of the same page - common while picking the right
+    element - otherwise redrive a full navigate plus DOM walk. Only
+    successes are cached; a failed scan is retried on the next press.
+    """
+    try:
+        elements = _scan_or_raise(url)
+    except RuntimeError as e:
+        return False, str(e)
+    # A cache hit skips the scan's navigation, but the click paths all
+    # act on the browser's current page - scanning A, B, then A again
+    # within the ttl would leave the browser on B while the UI shows
+    # A's elements. Navigate (a no-op when already there, so the fast
+    # path stays fast) and re-stamp the synthetic tags the fresh load
+    # wiped.
+    nav_ok, nav_message = navigate_to_page(url)
+    if not nav_ok:
+        return False, nav_message
+    if nav_message != "Already on page":
+        _retag_elements()
+    return True, elements
+
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def cached_screenshot(cache_key):
+    """capture_screenshot memoized on an explicit key.
+
+    The screenshot RPC (capture + PNG encode) is the slowest single MCP
+    call, and the capture button is often pressed repeatedly on the same
+    page. Callers bake whatever invalidates the view into cache_key
+    (url + action count), so a press after a click captures fresh while
+    duplicate presses are served from cache for up to five minutes.
+    """
+    return capture_screenshot()
+
+
+@st.cache_data(show_spinner=False)
+def _load_help(name):
+    """Static help markdown, read from disk once per process.
+
+    Keeping the guides out of the module source means the multi-KB
+    string literals are no longer parsed on import, and the cache
+    means the file is read once instead of on every rerun.
+    """
+    return (Path(__file__).parent / name).read_text(encoding="utf-8")
+
+
 st.set_page_config(page_title="Web Page Launcher", layout="wide", page_icon="🔗")
 st.title("🔗 Web Page Launcher")
 
-# Initialize session state
-if 'last_opened' not in st.session_state:
-    st.session_state.last_opened = None
-if 'open_count' not in st.session_state:
-    st.session_state.open_count = 0
-# Browser automation state
-if 'detected_elements' not in st.session_state:
-    st.session_state.detected_elements = []
-if 'selected_element' not in st.session_state:
-    st.session_state.selected_element = None
-if 'mcp_available' not in st.session_state:
-    st.session_state.mcp_available = check_mcp_available()
-if 'automation_status' not in st.session_state:
-    st.session_state.automation_status = "Not started"
-if 'last_screenshot' not in st.session_state:
-    st.session_state.last_screenshot = None
+# Initialize session state in one guarded update: a single membership
+# test per rerun instead of seven proxy lookups (the script reruns every
+# second while auto-refresh is on)
+if '_state_inited' not in st.session_state:
+    st.session_state.update({
+        'last_opened': None,
+        'open_count': 0,
+        # Browser automation state
+        'detected_elements': [],
+        'selected_element': None,
+        'mcp_available': check_mcp_available(),
+        'automation_status': "Not started",
+        'last_screenshot': None,
+        '_state_inited': True,
+    })
 
 st.markdown("""
 This app provides automated web page access with element detection and clicking.
@@ -202,15 +437,16 @@ with col1:
     #     st.session_state.open_count += 1
     #     st.success("✅ Login page opened in browser!")
     #     st.balloons()
-    if st.button("🌐 Open Login Page", use_container_width=True, type="primary", key="open_login"):
-        if login_url:
-            st.session_state.last_opened = "Login Page"
-            st.session_state.open_count += 1
-            st.markdown(f'<a href="{login_url}" target="_blank">Click here to open login page</a>', unsafe_allow_html=True)
-            st.success("✅ Login link ready - click above to open in browser!")
-            st.balloons()
-        else:
-            st.error("Please enter a login URL first")
+    # Native anchor: opens the tab client-side in one click, with no
+    # server rerun. The old st.button + markdown link needed two clicks
+    # and a full script rerun in between.
+    st.link_button(
+        "🌐 Open Login Page",
+        login_url or "#",
+        use_container_width=True,
+        type="primary",
+        disabled=not login_url,
+    )
 
     st.caption(f"🔗 URL: `{login_url}`")
 
@@ -222,19 +458,7 @@ with col1:
             st.error("No URL to copy")
 
 with col2:
-    st.info("""
-    **Instructions:**
-    1. Click **"🌐 Open Login Page"** button
-    2. The website will open in your default browser (Chrome, Edge, Firefox, etc.)
-    3. Log in normally with your username and password
-    4. Browser will remember your session
-    5. Return here for Step 2
-
-    **Benefits:**
-    - ✅ Full browser features (autofill, password manager)
-    - ✅ No iframe restrictions or blank pages
-    - ✅ Your login persists across browser sessions
-    """)
+    st.info(_load_help("help_login.md"))
 
 st.markdown("---")
 
@@ -264,12 +488,31 @@ with col1:
     if st.button("🔍 Scan Page for Elements", use_container_width=True, type="primary", disabled=not st.session_state.mcp_available):
         if user_url:
             with st.spinner("🔄 Scanning page for clickable elements..."):
-                success, result = scan_clickable_elements(user_url)
+                success, result = _cached_scan(user_url)
                 if success:
-                    st.session_state.detected_elements = result
+                    st.session_state.detected_elements = _merge_elements(
+                        st.session_state.detected_elements, result
+                    )
+                    st.session_state.automation_status = f"Found {len(result)} elements"
+                    st.success(f"✅ Found {len(result)} clickable elements!")
+                    celebrate_once()
+                else:
+                    st.error(f"❌ {result}")
+                    st.session_state.automation_status = f"Scan failed: {result}"
+        else:
+            st.error("Please enter a URL first")
+    if st.button("♻️ Force rescan", use_container_width=True, disabled=not st.session_state.mcp_available,
+                 help="Bypass the 5-minute scan cache and re-walk the page"):
+        if user_url:
+            _scan_or_raise.clear()
+            with st.spinner("🔄 Scanning page for clickable elements..."):
+                success, result = _cached_scan(user_url)
+                if success:
+                    st.session_state.detected_elements = _merge_elements(
+                        st.session_state.detected_elements, result
+                    )
                     st.session_state.automation_status = f"Found {len(result)} elements"
                     st.success(f"✅ Found {len(result)} clickable elements!")
-                    st.balloons()
                 else:
                     st.error(f"❌ {result}")
                     st.session_state.automation_status = f"Scan failed: {result}"
@@ -279,7 +522,19 @@ with col1:
 with col2:
     if st.button("📸 Capture Screenshot", use_container_width=True, disabled=not st.session_state.mcp_available):
         with st.spinner("📸 Capturing screenshot..."):
-            success, result = capture_screenshot()
+            # Keyed on URL + action count: a new auto/test click changes
+            # the page, so it gets a fresh capture; plain re-presses hit
+            # the cache
+            success, result = cached_screenshot(f"{user_url}|{st.session_state.open_count}")
+            if success:
+                st.session_state.last_screenshot = result
+                st.success("✅ Screenshot captured!")
+            else:
+                st.error(f"❌ {result}")
+    if st.button("🔄 Force fresh screenshot", use_container_width=True, disabled=not st.session_state.mcp_available):
+        cached_screenshot.clear()
+        with st.spinner("📸 Capturing screenshot..."):
+            success, result = cached_screenshot(f"{user_url}|{st.session_state.open_count}")
             if success:
                 st.session_state.last_screenshot = result
                 st.success("✅ Screenshot captured!")
@@ -289,27 +544,44 @@ with col2:
 # Display screenshot if available
 if st.session_state.last_screenshot:
     with st.expander("📸 View Latest Screenshot"):
-        st.image(st.session_state.last_screenshot, caption="Page Screenshot", use_column_width=True)
+        st.image(st.session_state.last_screenshot, caption="Page Screenshot", width=800)
 
 # Element selection UI
 if st.session_state.detected_elements:
     st.markdown("---")
     st.markdown("### 🎯 Select Element to Auto-Click")
 
-    # Create a formatted list for selection
-    element_options = {}
-    for elem in st.session_state.detected_elements:
-        status_icon = "✅" if elem['enabled'] else "⏸️"
-        label = f"{status_icon} [{elem['type']}] {elem['text'][:60]}"
-        element_options[label] = elem
+    # Label maps for the dropdown, cached on the scanned list: rebuilt
+    # only when a scan actually changes the elements instead of
+    # reformatting every label on each rerun. The JSON string key is
+    # hashable and cheap at this list size.
+    @st.cache_data(show_spinner=False)
+    def build_element_options(elements_json):
+        elements = json.loads(elements_json)
+        options = {}
+        for e in elements:
+            status_icon = "✅" if e['enabled'] else "⏸️"
+            options[f"{status_icon} [{e['type']}] {e['text'][:60]}"] = e
+        # Positions are offset by one for the leading "None" entry
+        index_of = {label: i + 1 for i, label in enumerate(options)}
+        return options, index_of
+
+    element_options, option_index = build_element_options(
+        json.dumps(st.session_state.detected_elements)
+    )
+
+    # Dict lookup instead of the old list.index() linear search per rerun
+    sel = st.session_state.selected_element
+    if sel is None:
+        selected_index = 0
+    else:
+        sel_label = f"{'✅' if sel['enabled'] else '⏸️'} [{sel['type']}] {sel['text'][:60]}"
+        selected_index = option_index.get(sel_label, 0)
 
     selected_label = st.selectbox(
         "Choose which element to automatically click during auto-refresh",
         options=["None"] + list(element_options.keys()),
-        index=0 if st.session_state.selected_element is None else
-              (list(element_options.keys()).index(
-                  f"{'✅' if st.session_state.selected_element['enabled'] else '⏸️'} [{st.session_state.selected_element['type']}] {st.session_state.selected_element['text'][:60]}"
-              ) + 1 if st.session_state.selected_element in st.session_state.detected_elements else 0)
+        index=selected_index
     )
 
     if selected_label != "None":
@@ -337,18 +609,16 @@ if st.session_state.detected_elements:
         with col1:
             if st.button("🧪 Test Click Now", use_container_width=True):
                 with st.spinner(f"🖱️ Clicking element: {elem['text'][:40]}..."):
-                    success, message = click_element_when_ready(
+                    success, message, screenshot = click_and_snapshot(
                         elem['selector'],
                         wait_enabled=False,
                         timeout=5
                     )
                     if success:
                         st.success(f"✅ {message}")
-                        # Capture screenshot after click
-                        success_ss, screenshot = capture_screenshot()
-                        if success_ss:
+                        if screenshot is not None:
                             st.session_state.last_screenshot = screenshot
-                            st.image(screenshot, caption="After Click", use_column_width=True)
+                            st.image(screenshot, caption="After Click", width=800)
                     else:
                         st.error(f"❌ {message}")
         with col2:
@@ -361,9 +631,7 @@ if st.session_state.detected_elements:
 elif not st.session_state.mcp_available and user_url:
     st.markdown("---")
     st.markdown("### Simple Mode (No Automation)")
-    if st.button("🌐 Open URL in Browser", use_container_width=True, type="primary"):
-        st.markdown(f'<a href="{user_url}" target="_blank">Click here to open page</a>', unsafe_allow_html=True)
-        st.success("✅ Link ready - click above to open!")
+    st.link_button("🌐 Open URL in Browser", user_url, use_container_width=True, type="primary")
 
 # Auto-refresh helper
 st.markdown("---")
@@ -412,39 +680,71 @@ if auto_refresh_enabled:
     current_time = time.time()
 
     # Check if it's time to refresh
-    if current_time >= st.session_state.next_refresh_time:
+    # 1s tolerance: the browser timer can land a few ms early, and
+    # skipping would push the action a whole interval out
+    if current_time >= st.session_state.next_refresh_time - 1.0:
         if user_url:
             # AUTOMATION MODE: Use browser automation if element is selected and MCP is available
             if st.session_state.selected_element and st.session_state.mcp_available:
-                with st.spinner(f"🤖 Automating click on: {st.session_state.selected_element['text'][:40]}..."):
-                    # Navigate to page
-                    nav_success, nav_message = navigate_to_page(user_url)
+                # Computed once per tick; the spinner, status strings and
+                # screenshot caption all reuse the same values
+                label_short = st.session_state.selected_element['text'][:40]
+                now_hms = time.strftime('%H:%M:%S')
+                with st.spinner(f"🤖 Automating click on: {label_short}..."):
+                    # force=True: the whole point of the tick is fresh
+                    # server state, so re-navigate even on the same URL
+                    nav_success, nav_message = navigate_to_page(user_url, force=True)
 
                     if nav_success:
-                        # Try to click the element (with wait if enabled)
-                        click_success, click_message = click_element_when_ready(
-                            st.session_state.selected_element['selector'],
-                            wait_enabled=True,
-                            timeout=wait_timeout
+                        selector = st.session_state.selected_element['selector']
+
+                        # The forced reload wiped the synthetic tags the
+                        # scan stamped; re-stamp them so the stored
+                        # selector (and the signature probe below)
+                        # resolves on the fresh DOM
+                        if 'data-grabit-id' in selector:
+                            _retag_elements()
+
+                        # Signature short-circuit: when the reloaded
+                        # subtree matches what the last failed attempt
+                        # saw, skip the readiness wait this cycle
+                        # instead of burning the whole timeout again
+                        sig = _element_signature(selector)
+                        unchanged = (
+                            sig is not None
+                            and sig == st.session_state.get('_last_elem_sig')
+                            and st.session_state.get('_last_click_failed')
                         )
+                        if unchanged:
+                            click_success = False
+                            click_message = "Target element unchanged since the last failed attempt"
+                            st.session_state.automation_status = f"⏭️ No change at {now_hms} - waiting"
+                            st.info("⏭️ Target element unchanged since the last failed attempt - waiting for the next cycle")
+                        else:
+                            # Try to click the element (with wait if enabled)
+                            click_success, click_message, screenshot = click_and_snapshot(
+                                selector,
+                                wait_enabled=True,
+                                timeout=wait_timeout
+                            )
+                            st.session_state._last_elem_sig = sig
+                            st.session_state._last_click_failed = not click_success
 
                         if click_success:
-                            st.session_state.automation_status = f"✅ Auto-clicked successfully at {time.strftime('%H:%M:%S')}"
+                            st.session_state.automation_status = f"✅ Auto-clicked successfully at {now_hms}"
                             st.session_state.open_count += 1
                             st.session_state.last_opened = f"Auto-click #{st.session_state.open_count}"
 
-                            # Capture screenshot after successful click
-                            ss_success, screenshot = capture_screenshot()
-                            if ss_success:
+                            if screenshot is not None:
                                 st.session_state.last_screenshot = screenshot
 
                             st.toast(f"🤖 {click_message}", icon="✅")
                             st.success(f"✅ {click_message}")
 
                             # Show screenshot if captured
-                            if ss_success:
-                                st.image(screenshot, caption=f"Auto-clicked at {time.strftime('%H:%M:%S')}", use_column_width=True)
-                        else:
+                            if screenshot is not None:
+                                st.image(screenshot, caption=f"Auto-clicked at {now_hms}", width=800)
+                        elif not unchanged:
                             st.session_state.automation_status = f"❌ Click failed: {click_message}"
                             st.error(f"❌ {click_message}")
                             st.warning("💡 Element may not be available yet. Continuing to monitor...")
@@ -454,31 +754,7 @@ if auto_refresh_enabled:
 
             # FALLBACK MODE: Simple URL opening for non-automation cases
             else:
-                if is_streamlit_cloud():
-                    # Streamlit Cloud: Use JavaScript anchor click
-                    auto_click_html = f"""
-                    <script>
-                    (function() {{
-                        const link = document.createElement('a');
-                        link.href = '{user_url}';
-                        link.target = '_blank';
-                        link.rel = 'noopener noreferrer';
-                        document.body.appendChild(link);
-                        link.click();
-                        document.body.removeChild(link);
-                    }})();
-                    </script>
-                    """
-                    components.html(auto_click_html, height=0)
-                    st.warning("🚨 **If no tab opened (popup blocked), click here:**")
-                    st.markdown(
-                        f'<a href="{user_url}" target="_blank" style="display:inline-block;padding:12px 24px;background-color:#ff4b4b;color:white;text-decoration:none;border-radius:5px;font-weight:bold;font-size:18px;">📱 CLICK TO OPEN PAGE</a>',
-                        unsafe_allow_html=True
-                    )
-                else:
-                    # Local development: Use native webbrowser.open
-                    webbrowser.open(user_url, new=2)
-                    st.toast("🔄 Opened new tab", icon="✅")
+                open_url_new_tab(user_url)
 
                 st.session_state.last_opened = f"Simple open #{st.session_state.open_count}"
                 st.session_state.open_count += 1
@@ -486,14 +762,21 @@ if auto_refresh_enabled:
             # Update timer for next refresh
             st.session_state.next_refresh_time = time.time() + refresh_interval
 
-    # Show countdown
-    time_remaining = int(st.session_state.next_refresh_time - current_time)
-    if time_remaining > 0:
-        st.info(f"⏳ Next action in: **{time_remaining}** seconds | Status: {st.session_state.automation_status}")
-        time.sleep(1)
-        st.rerun()
-    else:
-        st.rerun()
+    # Countdown as a fragment: only this info box rerenders each second.
+    # The old time.sleep(1) + st.rerun() pair re-executed the whole
+    # script (login section, statistics, guidance markdown) per tick and
+    # kept the script thread blocked in the sleep, so every widget felt
+    # frozen between reruns.
+    # Countdown display is pure presentation, so it runs in the browser;
+    # the only Python work per interval is the trigger fragment below
+    render_countdown(st.session_state.next_refresh_time, st.session_state.automation_status)
+
+    # Client-driven timer: the browser schedules the rerun via JS
+    # setTimeout (same component app.py uses), so no server thread sits
+    # in a sleep and concurrent widget events stay responsive. The
+    # next_refresh_time guard above decides whether a rerun actually
+    # fires the action.
+    st_autorefresh(interval=refresh_interval * 1000, key="auto_refresh_timer")
 
 else:
     # Reset timer when disabled
@@ -503,74 +786,27 @@ else:
 # ============================================================================
 # Session Statistics
 # ============================================================================
-st.markdown("---")
-st.subheader("📊 Session Statistics")
-
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    st.metric("Total Actions", st.session_state.open_count)
-
-with col2:
-    if st.session_state.last_opened:
-        st.metric("Last Action", st.session_state.last_opened)
-    else:
-        st.metric("Last Action", "None yet")
-
-with col3:
-    automation_status = "🤖 Enabled" if st.session_state.selected_element else "📱 Manual"
-    st.metric("Mode", automation_status)
-
-with col4:
-    mcp_status = "✅ Available" if st.session_state.mcp_available else "⚠️ Unavailable"
-    st.metric("MCP Puppeteer", mcp_status)
+st.markdown("---\n### 📊 Session Statistics")
+
+# One dataframe render instead of four columned st.metric widgets - each
+# metric is its own element in the rerun protocol, and this block
+# redraws on every pass. Same layout as qiangpiaoplaywright.py.
+stats = pd.DataFrame([{
+    "Total Actions": st.session_state.open_count,
+    "Last Action": st.session_state.last_opened or "None yet",
+    "Mode": "🤖 Enabled" if st.session_state.selected_element else "📱 Manual",
+    "MCP Puppeteer": "✅ Available" if st.session_state.mcp_available else "⚠️ Unavailable",
+}])
+st.dataframe(stats, hide_index=True, use_container_width=True)
 
 # ============================================================================
 # User Guidance
 # ============================================================================
 st.markdown("---")
-st.info("""
-### 📖 How to Use This App
-
-**Automated Workflow (Recommended):**
-1. **Step 1:** Click **"🌐 Open Login Page"** → Log in to the website in your browser
-2. **Step 2:** Enter the target page URL
-3. Click **"🔍 Scan Page for Elements"** → App detects all clickable buttons/links
-4. Select which element to auto-click from the dropdown
-5. Click **"🧪 Test Click Now"** to verify you selected the right element
-6. Enable **"Auto-refresh automation"** to start monitoring
-7. The app will automatically navigate to the page, wait for the element to be enabled, and click it!
-
-**Auto-Refresh Automation:**
-- **Interval**: How often to check the page (10-3600 seconds)
-- **Wait Timeout**: How long to wait for element to become enabled (5-120 seconds)
-- Perfect for booking systems, ticket sales, or any button that becomes available at specific times
-- Captures screenshot after each successful click for verification
-
-**Button Reference:**
-- **🔍 Scan Page for Elements** - Detects all clickable elements on the page
-- **📸 Capture Screenshot** - Takes a screenshot of the current page
-- **🧪 Test Click Now** - Manually test clicking the selected element
-- **Enable auto-refresh automation** - Starts automated monitoring and clicking
-
-**How It Works:**
-- ✅ **Browser Automation** - Uses MCP Puppeteer to control a headless browser
-- ✅ **Smart Waiting** - Monitors element state and clicks when it becomes enabled
-- ✅ **Visual Feedback** - Shows screenshots after each automated action
-- ✅ **Fallback Mode** - If MCP unavailable, falls back to simple URL opening
-- ✅ **Session Persistence** - Browser maintains login state between checks
-
-**Use Cases:**
-- 🎟️ Auto-click "Book Now" when reservations open
-- ⛳ Auto-submit tee time requests when slots become available
-- 🎫 Auto-purchase tickets when they go on sale
-- 📅 Auto-register for events when registration opens
-- 🛒 Auto-add items to cart when they're back in stock
-
-**Fallback Mode:**
-- If MCP Puppeteer is not available, the app will warn you and use simple URL opening
-- You can still use auto-refresh, but it will just open the URL without clicking elements
-""")
+# Collapsed by default: the full guide is ~2KB of markdown that nobody
+# needs re-rendered on every pass through the script
+with st.expander("📖 How to Use This App", expanded=False):
+    st.markdown(_load_help("help_usage.md"))
 
 # Footer
 st.markdown("---")
@@ -1,16 +1,8 @@
 import streamlit as st
-import streamlit.components.v1 as components
-import webbrowser
+from streamlit_autorefresh import st_autorefresh
 import time
-import os
-import platform
 
-# Environment detection
-def is_streamlit_cloud():
-    """Detect if running on Streamlit Cloud vs local development"""
-    # Streamlit Cloud runs on Linux with empty processor string
-    # Also check for 'appuser' which is the default Streamlit Cloud user
-    return platform.processor() == '' or os.getenv('USER') == 'appuser'
+from autorefresh import celebrate_once, open_url_new_tab, render_countdown
 
 st.set_page_config(page_title="BRS Golf Quick Access", layout="wide", page_icon="⛳")
 st.title("⛳ BRS Golf Quick Access")
@@ -60,7 +52,7 @@ with col1:
             st.session_state.open_count += 1
             st.markdown(f'<a href="{brs_login_url}" target="_blank">Click here to open login page</a>', unsafe_allow_html=True)
             st.success("✅ Login link ready - click above to open in browser!")
-            st.balloons()
+            celebrate_once()
         else:
             st.error("Please enter a login URL first")
 
@@ -221,55 +213,22 @@ if auto_refresh_enabled:
     current_time = time.time()
 
     # Check if it's time to refresh
-    if current_time >= st.session_state.next_refresh_time:
+    # 1s tolerance: the browser timer can land a few ms early, and
+    # skipping would push the action a whole interval out
+    if current_time >= st.session_state.next_refresh_time - 1.0:
         if user_url:
-            # Detect environment and use appropriate method
-            if is_streamlit_cloud():
-                # Streamlit Cloud: Use JavaScript programmatic anchor click
-                # This has better popup blocker bypass than window.open()
-                auto_click_html = f"""
-                <script>
-                (function() {{
-                    const link = document.createElement('a');
-                    link.href = '{user_url}';
-                    link.target = '_blank';
-                    link.rel = 'noopener noreferrer';
-                    document.body.appendChild(link);
-                    link.click();
-                    document.body.removeChild(link);
-                }})();
-                </script>
-                """
-
-                # Render the auto-click component
-                components.html(auto_click_html, height=0)
-
-                # Show fallback link only on cloud (where popup blocking is likely)
-                st.warning("🚨 **If no tab opened (popup blocked), click here:**")
-                st.markdown(
-                    f'<a href="{user_url}" target="_blank" style="display:inline-block;padding:12px 24px;background-color:#ff4b4b;color:white;text-decoration:none;border-radius:5px;font-weight:bold;font-size:18px;">📱 CLICK TO OPEN TEE SHEET</a>',
-                    unsafe_allow_html=True
-                )
-            else:
-                # Local development: Use native webbrowser.open (works perfectly)
-                webbrowser.open(user_url, new=2)
-
-            # Update session state (same for both environments)
+            # Shared cloud-vs-local fallback (see autorefresh.py)
+            open_url_new_tab(user_url, fallback_label="📱 CLICK TO OPEN TEE SHEET")
+
             st.session_state.last_opened = f"Auto-refresh #{st.session_state.open_count}"
             st.session_state.open_count += 1
             st.session_state.next_refresh_time = time.time() + refresh_interval
 
-            # Show success message
-            st.toast("🔄 Auto-refreshed! New tab opened.", icon="✅")
-
-    # Show countdown
-    time_remaining = int(st.session_state.next_refresh_time - current_time)
-    if time_remaining > 0:
-        st.info(f"⏳ Next refresh in: **{time_remaining}** seconds")
-        time.sleep(1)
-        st.rerun()
-    else:
-        st.rerun()
+    # Countdown ticks in the browser; the server only reruns when the
+    # st_autorefresh timer fires at the end of the interval, not every
+    # second like the old time.sleep(1) + st.rerun() loop
+    render_countdown(st.session_state.next_refresh_time, f"refreshing every {refresh_interval}s")
+    st_autorefresh(interval=refresh_interval * 1000, key="auto_refresh_timer")
 
 else:
     # Reset timer when disabled